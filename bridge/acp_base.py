@@ -976,6 +976,12 @@ class AcpBridge(BaseBridge):
             return
         self._cancel_client_schedule(key)
 
+        # Same payload on every fire — build it once per schedule.
+        wake = {
+            "wake_prompt": prompt,
+            "display_message": "↻ " + prompt.strip().split("\n", 1)[0][:60],
+        }
+
         async def _run() -> None:
             try:
                 # Let the current turn finish emitting tool_result / end_turn.
@@ -988,11 +994,7 @@ class AcpBridge(BaseBridge):
                 while True:
                     nxt = (time.time() + interval_sec) if recurring else None
                     self._emit_loop_scheduled(nxt)
-                    display = "↻ " + prompt.strip().split("\n", 1)[0][:60]
-                    send_notification("notification_wake", {
-                        "wake_prompt": prompt,
-                        "display_message": display,
-                    })
+                    send_notification("notification_wake", wake)
                     self.file_log(
                         f"client_schedule[{key}]: wake fired "
                         f"({len(prompt)} chars)")
@@ -585,9 +585,7 @@ class CodexBridge(BaseBridge):
             delta = params.get("delta", "")
             item_id = params.get("itemId", "")
             if delta and item_id:
-                if item_id not in self._command_output:
-                    self._command_output[item_id] = []
-                self._command_output[item_id].append(delta)
+                self._command_output.setdefault(item_id, []).append(delta)
 
         elif method == "thread/tokenUsage/updated":
             self._last_usage = params
@@ -84,6 +84,7 @@ from .text_cmds import (  # noqa: F401
     ClaudeInsertCommand,
     ClaudeToggleTasksFoldCommand,
     ClaudeReplaceCommand,
+    ClaudeBatchEditCommand,
     ClaudeReplaceContentCommand,
     ClaudeInsertNewlineCommand,
     NoopCommand,
@@ -277,10 +277,27 @@ class ClaudeGoalClearCommand(sublime_plugin.WindowCommand):
             s.handle_goal_command("clear")
 
 
+def _unlock_for_edit(view, read_only):
+    """Unlock for a plugin edit when the caller passes the state to leave."""
+    if read_only is not None:
+        view.set_read_only(False)
+
+
+def _leave_read_only(view, read_only):
+    if read_only:
+        view.set_read_only(True)
+
+
 class ClaudeInsertCommand(sublime_plugin.TextCommand):
-    """Insert text at position in Claude output view."""
-    def run(self, edit, pos, text):
+    """Insert text at position in Claude output view.
+
+    read_only: if given, the view is unlocked for the edit and left in
+    that state afterwards.
+    """
+    def run(self, edit, pos, text, read_only=None):
+        _unlock_for_edit(self.view, read_only)
         self.view.insert(edit, pos, text)
+        _leave_read_only(self.view, read_only)
 
 
 class ClaudeToggleTasksFoldCommand(sublime_plugin.TextCommand):
@@ -310,9 +327,23 @@ class ClaudeToggleTasksFoldCommand(sublime_plugin.TextCommand):
 
 
 class ClaudeReplaceCommand(sublime_plugin.TextCommand):
-    """Replace region in Claude output view."""
-    def run(self, edit, start, end, text):
+    """Replace region in Claude output view (read_only as for claude_insert)."""
+    def run(self, edit, start, end, text, read_only=None):
+        _unlock_for_edit(self.view, read_only)
         self.view.replace(edit, sublime.Region(start, end), text)
+        _leave_read_only(self.view, read_only)
+
+
+class ClaudeBatchEditCommand(sublime_plugin.TextCommand):
+    """Apply several [start, end) -> text edits under one edit token.
+
+    ops are applied right-to-left so earlier offsets stay valid.
+    """
+    def run(self, edit, ops, read_only=None):
+        _unlock_for_edit(self.view, read_only)
+        for start, end, text in sorted(ops, key=lambda op: op[0], reverse=True):
+            self.view.replace(edit, sublime.Region(start, end), text)
+        _leave_read_only(self.view, read_only)
 
 
 class ClaudeReplaceContentCommand(sublime_plugin.TextCommand):
@@ -849,10 +880,10 @@ class ClaudeOrderGotoCommand(sublime_plugin.TextCommand):
 
     def _find_edit_entry(self, rel_path: str, line_num: int):
         """Find edit entry from relative path and line number."""
-        from ..order_table import get_table, _relative_path
+        from ..order_table import get_table, _folder_prefixes, _relative_to
 
         window = self.view.window()
-        folders = window.folders() if window else []
+        prefixes = _folder_prefixes(window.folders() if window else [])
         table = get_table(window)
         if not table:
             return None
@@ -861,12 +892,12 @@ class ClaudeOrderGotoCommand(sublime_plugin.TextCommand):
         if rel_path.startswith("..."):
             suffix = rel_path[3:]
             for e in table.list_edits():
-                full_rel = _relative_path(e["file_path"], folders)
+                full_rel = _relative_to(e["file_path"], prefixes)
                 if full_rel.endswith(suffix) and e["line_num"] == line_num:
                     return e
         else:
             for e in table.list_edits():
-                if _relative_path(e["file_path"], folders) == rel_path and e["line_num"] == line_num:
+                if _relative_to(e["file_path"], prefixes) == rel_path and e["line_num"] == line_num:
                     return e
         return None
 
@@ -1031,7 +1062,7 @@ class ClaudeEditMessageCommand(sublime_plugin.TextCommand):
     def run(self, edit):
         import re
         import os
-        from ..order_table import get_table, _relative_path
+        from ..order_table import get_table, _folder_prefixes, _relative_to
 
         if not self.view.settings().get("order_table_view"):
             return
@@ -1046,7 +1077,7 @@ class ClaudeEditMessageCommand(sublime_plugin.TextCommand):
         if not table:
             return
 
-        folders = window.folders() if window else []
+        prefixes = _folder_prefixes(window.folders() if window else [])
 
         # Find which edit entry is selected
         line_region = self.view.line(sel[0])
@@ -1064,7 +1095,7 @@ class ClaudeEditMessageCommand(sublime_plugin.TextCommand):
         # Find the specific edit
         target_edit = None
         for e in table.list_edits():
-            full_rel = _relative_path(e["file_path"], folders)
+            full_rel = _relative_to(e["file_path"], prefixes)
             if rel_path.startswith("..."):
                 matches = full_rel.endswith(rel_path[3:])
             else:
@@ -1137,7 +1168,7 @@ class ClaudeClearEditsCommand(sublime_plugin.TextCommand):
 
     def run(self, edit, all_edits=False):
         import re
-        from ..order_table import get_table, refresh_order_table, _relative_path
+        from ..order_table import get_table, refresh_order_table, _folder_prefixes, _relative_to
 
         if not self.view.settings().get("order_table_view"):
             return
@@ -1155,7 +1186,7 @@ class ClaudeClearEditsCommand(sublime_plugin.TextCommand):
             sublime.set_timeout(lambda: refresh_order_table(window), 10)
             return
 
-        folders = window.folders() if window else []
+        prefixes = _folder_prefixes(window.folders() if window else [])
         all_edits_list = table.list_edits()
 
         sel = self.view.sel()
@@ -1191,7 +1222,7 @@ class ClaudeClearEditsCommand(sublime_plugin.TextCommand):
 
                 # Find matching edit
                 for e in all_edits_list:
-                    full_rel = _relative_path(e["file_path"], folders)
+                    full_rel = _relative_to(e["file_path"], prefixes)
                     if rel_path.startswith("..."):
                         matches = full_rel.endswith(rel_path[3:])
                     else:
@@ -1296,7 +1327,7 @@ class ClaudeFocusAgentCommand(sublime_plugin.TextCommand):
 
     def run(self, edit):
         import re
-        from ..order_table import get_table, _relative_path
+        from ..order_table import get_table, _folder_prefixes, _relative_to
 
         if not self.view.settings().get("order_table_view"):
             return
@@ -1306,7 +1337,7 @@ class ClaudeFocusAgentCommand(sublime_plugin.TextCommand):
         if not table:
             return
 
-        folders = window.folders() if window else []
+        prefixes = _folder_prefixes(window.folders() if window else [])
 
         # Get current line
         sel = self.view.sel()
@@ -1328,7 +1359,7 @@ class ClaudeFocusAgentCommand(sublime_plugin.TextCommand):
         # Find the specific edit
         target_edit = None
         for e in table.list_edits():
-            full_rel = _relative_path(e["file_path"], folders)
+            full_rel = _relative_to(e["file_path"], prefixes)
             if rel_path.startswith("..."):
                 matches = full_rel.endswith(rel_path[3:])
             else:
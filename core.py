@@ -147,6 +147,13 @@ def plugin_unloaded() -> None:
     except Exception:
         pass
 
+    try:
+        from . import order_table
+        order_table.flush_all()
+        order_table.stop_daemon_writer()
+    except Exception:
+        pass
+
     from . import mcp_server
     mcp_server.stop()
 
@@ -9,6 +9,7 @@ Run as a module:
     python -m grok_proxy --login          # interactive xAI OAuth
 """
 import argparse
+import hmac
 import http.client
 import json
 import os
@@ -25,6 +26,7 @@ from . import translate_request as tr
 from . import translate_response as rr
 
 DEFAULT_PORT = 8787
+MAX_IDLE_UPSTREAM = 4  # keep-alive connections parked for reuse
 DEFAULT_DATA_DIR = os.path.expanduser("~/.claude/grok_proxy")
 
 # Embedded minimal Grok catalog for GET /v1/models (Anthropic shape).
@@ -42,16 +44,47 @@ def _anthropic_error(status, err_type, message):
     return status, body
 
 
+# Static error bodies, encoded once at import.
+_UNAUTHORIZED = _anthropic_error(401, "authentication_error",
+                                 "invalid or missing auth token")
+_NOT_FOUND = (404, b'{"error":"not found"}')
+
+
 class _State:
     """Shared per-process state handed to the request handler."""
 
     def __init__(self, auth_token, credential, base_url):
         self.auth_token = auth_token
+        self._auth_b = auth_token.encode("utf-8") if auth_token else None
         self.credential = credential  # tokens.Credential or None
         self.base_url = base_url      # e.g. https://api.x.ai/v1
+        # upstream target, parsed once: (scheme, host, port, responses path)
+        parsed = urllib.parse.urlparse(base_url)
+        self.upstream = (parsed.scheme, parsed.hostname,
+                         parsed.port or (443 if parsed.scheme == "https" else 80),
+                         (parsed.path.rstrip("/") or "") + "/responses")
+        # shared by every upstream connection; create_default_context()
+        # reloads the system CA bundle on each call
+        self.ssl_context = ssl.create_default_context()
+        self._idle = []  # keep-alive upstream connections, LIFO
+        self._idle_lock = threading.Lock()
+
+    def take_conn(self):
+        with self._idle_lock:
+            return self._idle.pop() if self._idle else None
+
+    def release_conn(self, resp):
+        """Park the response's connection for reuse if it was fully drained."""
+        conn = resp._conn
+        if resp.isclosed() and not resp.will_close:
+            with self._idle_lock:
+                if len(self._idle) < MAX_IDLE_UPSTREAM:
+                    self._idle.append(conn)
+                    return
+        conn.close()
 
     def authorized(self, handler):
-        if not self.auth_token:
+        if not self._auth_b:
             return True
         auth = handler.headers.get("Authorization", "")
         token = ""
@@ -62,7 +95,7 @@ class _State:
         if not token:
             xkey = handler.headers.get("x-api-key", "")
             token = xkey.strip()
-        return token == self.auth_token
+        return hmac.compare_digest(self._auth_b, token.encode("utf-8"))
 
 
 class Handler(BaseHTTPRequestHandler):
@@ -93,38 +126,31 @@ class Handler(BaseHTTPRequestHandler):
 
     def _require_auth(self):
         if not self.state.authorized(self):
-            status, body = _anthropic_error(401, "authentication_error",
-                                            "invalid or missing auth token")
-            self._send(status, body)
+            self._send(*_UNAUTHORIZED)
             return False
         return True
 
     # --- routing ----------------------------------------------------------
     def do_GET(self):
-        parsed = urllib.parse.urlparse(self.path)
-        if parsed.path == "/v1/models":
-            if not self._require_auth():
-                return
-            self._models()
-        elif parsed.path == "/healthz":
-            self._send(200, b'{"status":"ok"}')
-        else:
-            self._send(404, b'{"error":"not found"}')
+        self._route(self._GET_ROUTES)
 
     def do_POST(self):
-        parsed = urllib.parse.urlparse(self.path)
-        if parsed.path == "/v1/messages":
-            if not self._require_auth():
-                return
-            self._messages()
-        elif parsed.path == "/v1/messages/count_tokens":
-            if not self._require_auth():
-                return
-            self._count_tokens()
-        else:
-            self._send(404, b'{"error":"not found"}')
+        self._route(self._POST_ROUTES)
+
+    def _route(self, routes):
+        route = routes.get(urllib.parse.urlparse(self.path).path)
+        if route is None:
+            self._send(*_NOT_FOUND)
+            return
+        endpoint, needs_auth = route
+        if needs_auth and not self._require_auth():
+            return
+        endpoint(self)
 
     # --- endpoints --------------------------------------------------------
+    def _healthz(self):
+        self._send(200, b'{"status":"ok"}')
+
     def _models(self):
         is_anthropic = bool(self.headers.get("Anthropic-Version")) or \
             "claude" in (self.headers.get("User-Agent", "").lower())
@@ -198,7 +224,7 @@ class Handler(BaseHTTPRequestHandler):
             status, b = _anthropic_error(self._map_status(upstream.status),
                                          "api_error", "upstream xAI error: %s" % err_body[:500])
             try:
-                upstream._conn.close()
+                self.state.release_conn(upstream)
             except Exception:
                 pass
             self._send(status, b)
@@ -224,9 +250,7 @@ class Handler(BaseHTTPRequestHandler):
         # always send stream:true to xAI; for non-stream Anthropic requests we
         # consume the whole SSE and synthesize one JSON response (matches Go).
         body["stream"] = True
-        parsed = urllib.parse.urlparse(self.state.base_url)
-        host = parsed.hostname
-        path = (parsed.path.rstrip("/") or "") + "/responses"
+        scheme, host, port, path = self.state.upstream
         headers = {
             "Content-Type": "application/json",
             "Authorization": "Bearer " + access_token,
@@ -242,15 +266,41 @@ class Handler(BaseHTTPRequestHandler):
         payload = json.dumps(body).encode("utf-8")
         headers["Content-Length"] = str(len(payload))
 
-        if parsed.scheme == "https":
-            ctx = ssl.create_default_context()
-            conn = http.client.HTTPSConnection(host, port=parsed.port or 443,
-                                               timeout=30, context=ctx)
+        # reuse a parked keep-alive connection; if upstream dropped it while
+        # idle, retry once on a fresh one. Only stale-socket errors before any
+        # response byte are retried: the POST is not idempotent (a timeout may
+        # mean xAI is already generating a billed completion).
+        conn = self.state.take_conn()
+        if conn is not None:
+            try:
+                conn.request("POST", path, body=payload, headers=headers)
+            except (ConnectionResetError, BrokenPipeError):
+                conn.close()
+                conn = None
+            except Exception:
+                conn.close()
+                raise
+        if conn is not None:
+            try:
+                resp = conn.getresponse()
+            except http.client.RemoteDisconnected:
+                # peer closed with an empty status line — nothing was read
+                conn.close()
+            except Exception:
+                conn.close()
+                raise
+            else:
+                resp._conn = conn
+                return resp
+
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port=port,
+                                               timeout=30, context=self.state.ssl_context)
         else:
-            conn = http.client.HTTPConnection(host, port=parsed.port or 80, timeout=30)
+            conn = http.client.HTTPConnection(host, port=port, timeout=30)
         conn.request("POST", path, body=payload, headers=headers)
         resp = conn.getresponse()
-        resp._conn = conn  # keep ref so we can close it
+        resp._conn = conn  # keep ref so we can release/close it
         return resp
 
     @staticmethod
@@ -297,7 +347,7 @@ class Handler(BaseHTTPRequestHandler):
             except Exception:
                 pass
             try:
-                resp._conn.close()
+                self.state.release_conn(resp)
             except Exception:
                 pass
 
@@ -316,7 +366,7 @@ class Handler(BaseHTTPRequestHandler):
         # the real items only on output_item.done, with output:[] at completion.
         data_lines = [d for d in self._iter_data_lines(resp) if d != "[DONE]"]
         try:
-            resp._conn.close()
+            self.state.release_conn(resp)
         except Exception:
             pass
 
@@ -335,18 +385,33 @@ class Handler(BaseHTTPRequestHandler):
         self._cache_completed(session_key, completed)
         self._send(200, json.dumps(out).encode("utf-8"))
 
+    # path -> (endpoint, requires auth); endpoints resolved once at class creation
+    _GET_ROUTES = {
+        "/v1/models": (_models, True),
+        "/healthz": (_healthz, False),
+    }
+    _POST_ROUTES = {
+        "/v1/messages": (_messages, True),
+        "/v1/messages/count_tokens": (_count_tokens, True),
+    }
+
 
 # --- server bootstrap -------------------------------------------------------
 
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default listen backlog is 5; Claude Code opens bursts of
+    # parallel connections (subagents, count_tokens) on session start
+    request_queue_size = 128
+
+
 def make_server(port, auth_token, credential, base_url=oauth.DEFAULT_BASE_URL):
     state = _State(auth_token=auth_token, credential=credential, base_url=base_url)
 
     class BoundHandler(Handler):
         pass
     BoundHandler.state = state
-    srv = ThreadingHTTPServer(("127.0.0.1", port), BoundHandler)
-    srv.daemon_threads = True
-    return srv
+    return _Server(("127.0.0.1", port), BoundHandler)
 
 
 def _load_credential(data_dir, base_url):
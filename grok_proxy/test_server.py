@@ -0,0 +1,66 @@
+"""Unit tests for grok_proxy.server — runnable as `python -m grok_proxy.test_server`.
+
+Uses stdlib unittest only; upstream connections are faked, nothing hits the network.
+"""
+import http.client
+import socket
+import types
+import unittest
+
+from . import server
+
+
+class _FakeConn:
+    def __init__(self, fail=None):
+        self.fail = fail
+        self.requests = 0
+        self.closed = False
+
+    def request(self, *a, **kw):
+        self.requests += 1
+
+    def getresponse(self):
+        if self.fail is not None:
+            raise self.fail
+        return types.SimpleNamespace()
+
+    def close(self):
+        self.closed = True
+
+
+class UpstreamRetryTest(unittest.TestCase):
+    def _post(self, parked):
+        fresh = []
+
+        def _new_conn(*a, **kw):
+            fresh.append(_FakeConn())
+            return fresh[-1]
+
+        orig = server.http.client.HTTPConnection
+        server.http.client.HTTPConnection = _new_conn
+        try:
+            h = server.Handler.__new__(server.Handler)
+            h.state = types.SimpleNamespace(
+                take_conn=lambda: parked,
+                upstream=("http", "127.0.0.1", 1, "/v1/responses"))
+            return h._post_upstream({"model": "grok"}, "tok", stream=True), fresh
+        finally:
+            server.http.client.HTTPConnection = orig
+
+    def test_stale_keepalive_retried_on_fresh_connection(self):
+        parked = _FakeConn(fail=http.client.RemoteDisconnected("closed"))
+        resp, fresh = self._post(parked)
+        self.assertTrue(parked.closed)
+        self.assertEqual(len(fresh), 1)
+        self.assertIs(resp._conn, fresh[0])
+
+    def test_timeout_is_not_resent(self):
+        parked = _FakeConn(fail=socket.timeout("slow upstream"))
+        with self.assertRaises(socket.timeout):
+            self._post(parked)
+        self.assertTrue(parked.closed)
+        self.assertEqual(parked.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -4,12 +4,12 @@ Global notalone2 client for sublime-claude.
 ONE pool connection for the entire plugin. Routes injects to correct sessions.
 """
 import json
-import os
 import socket
 import threading
+import time
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict
 
 import sublime
 
@@ -30,6 +30,7 @@ class NotaloneClient:
     def __init__(self):
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()  # cuts reconnect backoff short on stop()
         # Pending notifications per session: view_id -> list of (wake_prompt, context, timestamp)
         self._pending: Dict[int, list] = {}
         self._pending_lock = threading.Lock()
@@ -43,6 +44,7 @@ class NotaloneClient:
         if self._running:
             return
         self._running = True
+        self._stop_event.clear()
         self._thread = threading.Thread(target=self._listen_loop, daemon=True)
         self._thread.start()
         logger.info("notalone: client started")
@@ -50,11 +52,11 @@ class NotaloneClient:
     def stop(self):
         """Stop the client."""
         self._running = False
+        self._stop_event.set()
         logger.info("notalone: client stopped")
 
     def _listen_loop(self):
         """Listen for inject callbacks (runs in thread)."""
-        import time
         reconnect_delay = 2
 
         if not hasattr(socket, 'AF_UNIX'):
@@ -142,13 +144,11 @@ class NotaloneClient:
                         pass  # benign: best-effort socket close on reconnect
 
             if self._running:
-                time.sleep(reconnect_delay)
+                self._stop_event.wait(reconnect_delay)
                 reconnect_delay = min(reconnect_delay * 1.5, 30)
 
     def _handle_inject(self, inject: dict):
         """Handle an inject callback - route to correct session."""
-        import time
-
         session_id = inject.get("session_id", "")
         wake_prompt = inject.get("wake_prompt", "")
         context = inject.get("context")
@@ -171,12 +171,11 @@ class NotaloneClient:
 
         # Queue the notification with timestamp
         with self._pending_lock:
-            if view_id not in self._pending:
-                self._pending[view_id] = []
-            self._pending[view_id].append((wake_prompt, context, time.time()))
+            pending = self._pending.setdefault(view_id, [])
+            pending.append((wake_prompt, context, time.time()))
 
             # Check if batch size reached - force immediate flush
-            if len(self._pending[view_id]) >= MAX_BATCH_SIZE:
+            if len(pending) >= MAX_BATCH_SIZE:
                 print(f"[Claude] notalone: batch size {MAX_BATCH_SIZE} reached for view {view_id}, flushing")
                 sublime.set_timeout(lambda vid=view_id: self._flush_batch(vid), 0)
                 return
@@ -307,6 +306,18 @@ class NotaloneClient:
             self._send_channel_response(channel_id, {"error": "interrupted"})
 
     def _send_channel_response(self, channel_id: str, response):
+        """Send response back to daemon without blocking the caller.
+
+        Mostly called on the main thread (channel processing, user
+        interrupt); the socket round-trip can take up to its 5s timeout.
+        """
+        threading.Thread(
+            target=self._send_channel_response_sync,
+            args=(channel_id, response),
+            daemon=True,
+        ).start()
+
+    def _send_channel_response_sync(self, channel_id: str, response):
         """Send response back to daemon via new connection."""
         try:
             sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
@@ -342,7 +353,6 @@ class NotaloneClient:
 
     def _periodic_flush(self):
         """Periodically check for aged batches and flush them."""
-        import time
         self._flush_timer = None
 
         now = time.time()
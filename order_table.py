@@ -2,28 +2,92 @@
 import os
 import json
 import time
+import bisect
+import queue
+import socket
+import sys
+import threading
 import sublime
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 
 
-# Local subscriptions: {project_root: [(view_id, wake_prompt), ...]}
-_order_subscriptions: Dict[str, List[Tuple[int, str]]] = {}
+# Local subscriptions: {project_root: {view_id: wake_prompt}}
+_order_subscriptions: Dict[str, Dict[int, str]] = {}
 
 
 def subscribe_to_orders(project_root: str, view_id: int, wake_prompt: str) -> str:
     """Subscribe a session to order notifications for a project."""
-    if project_root not in _order_subscriptions:
-        _order_subscriptions[project_root] = []
-    # Remove existing subscription for this view
-    _order_subscriptions[project_root] = [
-        (vid, wp) for vid, wp in _order_subscriptions[project_root] if vid != view_id
-    ]
-    _order_subscriptions[project_root].append((view_id, wake_prompt))
+    # Re-subscribing replaces the view's previous wake prompt
+    _order_subscriptions.setdefault(sys.intern(project_root), {})[view_id] = wake_prompt
     return f"order_sub_{view_id}"
 
 
+DAEMON_SOCKET_PATH = os.path.join(os.path.expanduser("~"), ".notalone", "notalone.sock")
+
+
+def _send_to_daemon(data: bytes):
+    """One connection per message, like the other notalone daemon clients."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(2)
+        sock.connect(DAEMON_SOCKET_PATH)
+        sock.sendall(data)
+    except Exception:
+        pass  # Silently fail - daemon may not support fire
+    finally:
+        sock.close()
+
+
+# Fires are sent off the UI thread; a stalled daemon drops messages past this
+_daemon_q: "queue.Queue[bytes]" = queue.Queue(maxsize=64)
+_daemon_writer: Optional[threading.Thread] = None
+
+
+def _daemon_writer_loop():
+    while True:
+        data = _daemon_q.get()
+        try:
+            if data is None:
+                return  # stop_daemon_writer sentinel
+            _send_to_daemon(data)
+        finally:
+            _daemon_q.task_done()
+
+
+def _queue_daemon_message(data: bytes):
+    global _daemon_writer
+    if _daemon_writer is None:
+        _daemon_writer = threading.Thread(target=_daemon_writer_loop, name="order-daemon-writer", daemon=True)
+        _daemon_writer.start()
+    try:
+        _daemon_q.put_nowait(data)
+    except queue.Full:
+        pass
+
+
+def stop_daemon_writer():
+    """Stop the writer thread (plugin unload) so reloads don't stack threads."""
+    global _daemon_writer
+    if _daemon_writer is None:
+        return
+    _daemon_writer = None
+    while True:
+        try:
+            _daemon_q.put_nowait(None)
+            return
+        except queue.Full:
+            # Stalled daemon: drop unsent fires to make room for the sentinel
+            try:
+                _daemon_q.get_nowait()
+                _daemon_q.task_done()
+            except queue.Empty:
+                pass
+
+
 CLAIM_TIMEOUT_SECS = 600  # 10 minutes - auto-release if claimed too long
+DONE_RETENTION = 50  # oldest done orders beyond this are dropped
+SAVE_DELAY_MS = 150  # coalesce bursts of mutations into one orders.json write
 
 
 def _add_order_region(view, order_id: str, row: int, col: int, selection_length: int = None, prompt: str = None):
@@ -68,7 +132,20 @@ class Order:
     done_by: Optional[str] = None  # agent_id
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "prompt": self.prompt,
+            "state": self.state,
+            "file_path": self.file_path,
+            "row": self.row,
+            "col": self.col,
+            "selection_length": self.selection_length,
+            "created_at": self.created_at,
+            "claimed_by": self.claimed_by,
+            "claimed_at": self.claimed_at,
+            "done_at": self.done_at,
+            "done_by": self.done_by,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Order":
@@ -102,19 +179,41 @@ class OrderTable:
     """Persistent order list for agent assignments."""
 
     def __init__(self, project_root: str):
-        self.project_root = project_root
+        self.project_root = sys.intern(project_root)  # dict key across module tables
         self.orders_file = os.path.join(project_root, ".claude", "orders.json")
         self._counter = 0
         self._orders: Dict[str, Order] = {}
         self._edits: List[EditEntry] = []
         self._edit_counter = 0
+        self._dirty = False
+        self._save_scheduled = False
+        self._version = 0  # bumped on every mutation; keys the list() cache
+        self._list_cache: Dict[Optional[str], Tuple[int, List[dict]]] = {}
+        # state -> order ids in created_at order, kept in step with _orders
+        self._ids_by_state: Dict[str, List[str]] = {"pending": [], "done": []}
+        self._unmark_ids: List[str] = []  # bookmarks to erase on next flush
+        self._file_stat: Optional[Tuple[int, int]] = None  # (mtime_ns, size) last read/written
+        # Static head of every daemon fire; only the context is encoded per order
+        self._daemon_prefix = (json.dumps({
+            "method": "fire",
+            "type": "order_added",
+            "params": {"project": self.project_root},
+        })[:-1] + ', "context": ').encode()
         self._load()
 
     def _load(self):
-        if os.path.exists(self.orders_file):
+        if self._dirty:
+            self.flush()  # don't let the reload clobber unsaved mutations
+        stat = self._stat_file()
+        if stat is not None and stat == self._file_stat:
+            return  # unchanged since we last read or wrote it
+        if stat is not None:
             try:
-                with open(self.orders_file, "r") as f:
-                    data = json.load(f)
+                with open(self.orders_file, "rb") as f:
+                    raw = f.read()
+                self._file_stat = stat
+                data = json.loads(raw)
+                self._version += 1
                 self._counter = data.get("counter", 0)
                 for order_data in data.get("orders", []):
                     order = Order.from_dict(order_data)
@@ -128,6 +227,59 @@ class OrderTable:
                     self._edits.append(EditEntry(**e))
             except Exception as e:
                 print(f"[OrderTable] Load failed: {e}")
+        self._rebuild_index()
+        if self._trim_done():
+            self._mark_dirty()
+
+    def _rebuild_index(self):
+        ordered = sorted(self._orders.values(), key=lambda o: o.created_at)
+        self._ids_by_state = {"pending": [], "done": []}
+        for o in ordered:
+            self._ids_by_state.setdefault(o.state, []).append(o.id)
+
+    def _index_insert(self, order: Order):
+        ids = self._ids_by_state.setdefault(order.state, [])
+        if not ids or self._orders[ids[-1]].created_at <= order.created_at:
+            ids.append(order.id)  # common case: newest order
+        else:
+            keys = [self._orders[i].created_at for i in ids]
+            ids.insert(bisect.bisect(keys, order.created_at), order.id)
+
+    def _trim_done(self, keep: Optional[str] = None) -> bool:
+        """Drop the earliest-completed done orders beyond DONE_RETENTION,
+        never `keep` (the order just completed)."""
+        done_ids = self._ids_by_state.get("done", [])
+        excess = len(done_ids) - DONE_RETENTION
+        if excess <= 0:
+            return False
+        orders = self._orders
+        candidates = [oid for oid in done_ids if oid != keep]
+        candidates.sort(key=lambda oid: (orders[oid].done_at or 0, orders[oid].created_at))
+        evict = set(candidates[:excess])
+        for oid in evict:
+            del orders[oid]
+        done_ids[:] = [oid for oid in done_ids if oid not in evict]
+        return True
+
+    def _index_remove(self, order: Order):
+        ids = self._ids_by_state.get(order.state)
+        if ids and order.id in ids:
+            ids.remove(order.id)
+
+    def _mark_dirty(self):
+        """Schedule a coalesced _save() on the main thread."""
+        self._version += 1
+        self._dirty = True
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            sublime.set_timeout(self.flush, SAVE_DELAY_MS)
+
+    def flush(self):
+        """Write pending changes now."""
+        self._save_scheduled = False
+        if self._dirty:
+            self._dirty = False
+            self._save()
 
     def _save(self):
         os.makedirs(os.path.dirname(self.orders_file), exist_ok=True)
@@ -138,11 +290,23 @@ class OrderTable:
             "edits": [asdict(e) for e in self._edits]
         }
         try:
-            with open(self.orders_file, "w") as f:
-                json.dump(data, f, indent=2)
+            # Encode up front and write once; a failed encode leaves the file intact
+            payload = json.dumps(data, indent=2).encode()
+            tmp = self.orders_file + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, self.orders_file)
+            self._file_stat = self._stat_file()
         except Exception as e:
             print(f"[OrderTable] Save failed: {e}")
 
+    def _stat_file(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.orders_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     def add(self, prompt: str, file_path: str = None, row: int = None, col: int = None, selection_length: int = None, view=None) -> Order:
         """Add an order."""
         self._counter += 1
@@ -155,7 +319,8 @@ class OrderTable:
             selection_length=selection_length
         )
         self._orders[order.id] = order
-        self._save()
+        self._index_insert(order)
+        self._mark_dirty()
         self._notify_order_added(order)
         if view and row is not None:
             _add_order_region(view, order.id, row, col, selection_length, prompt)
@@ -166,7 +331,7 @@ class OrderTable:
         from . import notalone
 
         # Build context
-        prompt_text = order.prompt if len(order.prompt) <= 500 else order.prompt[:500] + "..."
+        prompt_text = _trunc(order.prompt, 500)
         loc = f" @ {order.file_path}:{order.row+1}" if order.file_path else ""
         context = {
             "order_id": order.id,
@@ -179,12 +344,14 @@ class OrderTable:
         }
 
         # Notify local subscribers via notalone inject
-        subs = _order_subscriptions.get(self.project_root, [])
-        for view_id, wake_prompt_template in subs:
-            try:
-                wake_prompt = wake_prompt_template.format(context=context)
-            except (KeyError, ValueError):
-                wake_prompt = wake_prompt_template
+        subs = _order_subscriptions.get(self.project_root, {})
+        for view_id, wake_prompt_template in subs.items():
+            wake_prompt = wake_prompt_template
+            if "{" in wake_prompt_template or "}" in wake_prompt_template:
+                try:
+                    wake_prompt = wake_prompt_template.format(context=context)
+                except (KeyError, ValueError):
+                    pass
             notalone.inject_local(view_id, wake_prompt, context)
 
         if subs:
@@ -195,33 +362,21 @@ class OrderTable:
 
     def _fire_to_daemon(self, context: dict):
         """Fire notification to daemon for external agents."""
-        import socket
-        from pathlib import Path
-
-        socket_path = str(Path.home() / ".notalone" / "notalone.sock")
-        try:
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            sock.connect(socket_path)
-            msg = {
-                "method": "fire",
-                "type": "order_added",
-                "params": {"project": self.project_root},
-                "context": context
-            }
-            sock.sendall((json.dumps(msg) + "\n").encode())
-            sock.close()
-        except Exception:
-            pass  # Silently fail - daemon may not support fire
+        _queue_daemon_message(self._daemon_prefix + json.dumps(context).encode() + b"}\n")
 
     def list(self, state: str = None) -> List[dict]:
         """List orders as dicts. Auto-releases expired/orphaned claims."""
         self._auto_release_claims()
-        orders = list(self._orders.values())
+        cached = self._list_cache.get(state)
+        if cached and cached[0] == self._version:
+            return list(cached[1])
         if state:
-            orders = [o for o in orders if o.state == state]
-        orders = sorted(orders, key=lambda o: o.created_at)
-        return [o.to_dict() for o in orders]
+            orders = [self._orders[i] for i in self._ids_by_state.get(state, ())]
+        else:
+            orders = sorted(self._orders.values(), key=lambda o: o.created_at)
+        result = [o.to_dict() for o in orders]
+        self._list_cache[state] = (self._version, result)
+        return list(result)
 
     # --- Edit tracking ---
 
@@ -245,7 +400,7 @@ class OrderTable:
         # Keep only last 50 edits
         if len(self._edits) > 50:
             self._edits = self._edits[-50:]
-        self._save()
+        self._mark_dirty()
         return edit.id
 
     def clear_edits(self, file_path: str = None, edit_id: str = None):
@@ -261,7 +416,7 @@ class OrderTable:
             self._edits = [e for e in self._edits if e.file_path != file_path]
         else:
             self._edits = []
-        self._save()
+        self._mark_dirty()
 
     def list_edits(self) -> List[dict]:
         """List recent edits."""
@@ -290,7 +445,7 @@ class OrderTable:
                 except ValueError:
                     pass
         if released:
-            self._save()
+            self._mark_dirty()
             for oid, reason in released:
                 print(f"[OrderTable] auto-released {oid} ({reason})")
 
@@ -306,7 +461,7 @@ class OrderTable:
                 return False, f"Already claimed by {order.claimed_by}"
         order.claimed_by = agent_id
         order.claimed_at = time.time()
-        self._save()
+        self._mark_dirty()
         return True, "Claimed"
 
     def release(self, order_id: str, agent_id: str = None) -> Tuple[bool, str]:
@@ -320,7 +475,7 @@ class OrderTable:
             return False, f"Claimed by different agent ({order.claimed_by})"
         order.claimed_by = None
         order.claimed_at = None
-        self._save()
+        self._mark_dirty()
         return True, "Released"
 
     def complete(self, order_id: str, agent_id: str = None) -> Tuple[bool, str]:
@@ -330,12 +485,15 @@ class OrderTable:
             return False, f"Order {order_id} not found"
         if order.state == "done":
             return False, "Already done"
+        self._index_remove(order)
         order.state = "done"
         order.done_at = time.time()
         order.done_by = agent_id
         order.claimed_by = None  # Clear claim on completion
         order.claimed_at = None
-        self._save()
+        self._index_insert(order)
+        self._trim_done(keep=order_id)
+        self._mark_dirty()
         self._remove_bookmark(order_id)
         return True, "Done"
 
@@ -344,12 +502,13 @@ class OrderTable:
         if order_id not in self._orders:
             return False, f"Order {order_id} not found"
         order = self._orders.pop(order_id)
+        self._index_remove(order)
         # Save to undo stack
         if self.project_root not in _undo_stack:
             _undo_stack[self.project_root] = []
         _undo_stack[self.project_root].append(order)
         _undo_stack[self.project_root] = _undo_stack[self.project_root][-20:]
-        self._save()
+        self._mark_dirty()
         self._remove_bookmark(order_id)
         return True, "Deleted"
 
@@ -358,24 +517,37 @@ class OrderTable:
         if self.project_root not in _undo_stack or not _undo_stack[self.project_root]:
             return False, "Nothing to undo"
         order = _undo_stack[self.project_root].pop()
+        if order.id in self._unmark_ids:
+            self._unmark_ids.remove(order.id)
         self._orders[order.id] = order
-        self._save()
+        self._index_insert(order)
+        self._mark_dirty()
         return True, f"Restored {order.id}"
 
     def _remove_bookmark(self, order_id: str):
-        """Remove bookmark and phantom for an order from all views."""
+        """Queue bookmark + phantom removal; erased from all views in one pass."""
+        if not self._unmark_ids:
+            sublime.set_timeout(self._flush_unmarks, 0)
+        self._unmark_ids.append(order_id)
+
+    def _flush_unmarks(self):
+        keys = [f"claude_order_{oid}" for oid in self._unmark_ids]
+        self._unmark_ids = []
         window = sublime.active_window()
-        if window:
-            for view in window.views():
-                view.erase_regions(f"claude_order_{order_id}")
-                view.erase_phantoms(f"claude_order_{order_id}")
+        if not window or not keys:
+            return
+        for view in window.views():
+            for key in keys:
+                view.erase_regions(key)
+                view.erase_phantoms(key)
 
     def clear_done(self) -> int:
         """Remove all done orders."""
-        done_ids = [oid for oid, o in self._orders.items() if o.state == "done"]
+        done_ids = self._ids_by_state.get("done", [])
         for oid in done_ids:
             del self._orders[oid]
-        self._save()
+        self._ids_by_state["done"] = []
+        self._mark_dirty()
         return len(done_ids)
 
 
@@ -392,12 +564,45 @@ def _relative_time(timestamp: float) -> str:
         return f"{int(diff/86400)}d ago"
 
 
+def _line_diff(old: List[str], new: List[str]) -> Optional[Tuple[int, int, str]]:
+    """Smallest edit turning newline-terminated `old` lines into `new`.
+
+    Returns (start, end, text) to replace in the old buffer, or None if equal.
+    """
+    if old == new:
+        return None
+    n = min(len(old), len(new))
+    p = 0
+    while p < n and old[p] == new[p]:
+        p += 1
+    q = 0
+    while q < n - p and old[-1 - q] == new[-1 - q]:
+        q += 1
+    start = sum(len(l) + 1 for l in old[:p])
+    end = start + sum(len(l) + 1 for l in old[p:len(old) - q])
+    text = "".join(l + "\n" for l in new[p:len(new) - q])
+    return start, end, text
+
+
+def _trunc(text: str, n: int) -> str:
+    return text if len(text) <= n else text[:n] + "..."
+
+
+def _folder_prefixes(folders: List[str]) -> Tuple[str, ...]:
+    """Folder prefixes (with trailing sep), longest first so the nearest ancestor wins."""
+    return tuple(sorted((f + os.sep for f in folders), key=len, reverse=True))
+
+
+def _relative_to(file_path: str, prefixes: Tuple[str, ...]) -> str:
+    for prefix in prefixes:
+        if file_path.startswith(prefix):
+            return file_path[len(prefix):]
+    return os.path.basename(file_path)
+
+
 def _relative_path(file_path: str, folders: List[str]) -> str:
     """Get path relative to nearest project folder ancestor."""
-    for folder in folders:
-        if file_path.startswith(folder + os.sep):
-            return file_path[len(folder) + 1:]
-    return os.path.basename(file_path)
+    return _relative_to(file_path, _folder_prefixes(folders))
 
 
 # Table cache
@@ -415,9 +620,17 @@ def get_table(window) -> Optional[OrderTable]:
     return get_table_for_cwd(folders[0])
 
 
+def flush_all():
+    """Write any pending order table changes (plugin unload)."""
+    for table in _tables.values():
+        table.flush()
+
+
 def get_table_for_cwd(cwd: str) -> OrderTable:
     """Get order table for cwd."""
+    cwd = sys.intern(cwd)
     if cwd not in _tables:
+        _prune_stale()
         _tables[cwd] = OrderTable(cwd)
     return _tables[cwd]
 
@@ -428,22 +641,26 @@ def sync_bookmarks(window):
     if not table:
         return
 
-    pending = table.list("pending")
-    for order in pending:
+    by_file: Dict[str, List[dict]] = {}
+    for order in table.list("pending"):
         file_path = order.get("file_path")
-        if not file_path:
-            continue
-        row = order.get("row", 0)
-        col = order.get("col", 0)
-        selection_length = order.get("selection_length")
-        prompt = order.get("prompt")
-        order_id = order["id"]
+        if file_path:
+            by_file.setdefault(file_path, []).append(order)
+    if not by_file:
+        return
 
-        # Find view for this file
-        for view in window.views():
-            if view.file_name() == file_path:
-                _add_order_region(view, order_id, row, col, selection_length, prompt)
-                break
+    for view in window.views():
+        orders = by_file.pop(view.file_name(), None)
+        if not orders:
+            continue
+        for order in orders:
+            _add_order_region(
+                view, order["id"],
+                order.get("row", 0), order.get("col", 0),
+                order.get("selection_length"), order.get("prompt"),
+            )
+        if not by_file:
+            break
 
 
 # ─── Order Table View ──────────────────────────────────────────────────────
@@ -455,6 +672,9 @@ class OrderTableView:
         self.window = window
         self.table = table
         self.view = None
+        self._last_lines: Optional[List[str]] = None  # what the buffer holds
+        self._prefixes: Tuple[str, ...] = ()
+        self._loc_cache: Dict[Tuple[str, int, Optional[int]], str] = {}
         self._create_view()
 
     def _create_view(self):
@@ -495,58 +715,64 @@ class OrderTableView:
         done = self.table.list("done")
 
         lines = ["═══ ORDER TABLE ═══", ""]
+        add = lines.append
 
         # Get project folders for relative paths
-        folders = self.window.folders() if self.window else []
+        prefixes = _folder_prefixes(self.window.folders() if self.window else [])
+        if prefixes != self._prefixes:
+            self._prefixes = prefixes
+            self._loc_cache = {}
+        loc_cache, self._loc_cache = self._loc_cache, {}
+
+        def order_loc(o):
+            if not o.get("file_path"):
+                return ""
+            key = (o["file_path"], o.get("row", 0), o.get("selection_length"))
+            loc = loc_cache.get(key)
+            if loc is None:
+                sel = f" [{key[2]}ch]" if key[2] else ""
+                loc = f" @ {_relative_to(key[0], prefixes)}:{key[1] + 1}{sel}"
+            self._loc_cache[key] = loc
+            return loc
 
         if pending:
             claimed = [o for o in pending if o.get("claimed_by")]
             unclaimed = [o for o in pending if not o.get("claimed_by")]
-            lines.append(f"PENDING ({len(pending)})")
-            lines.append("─" * 50)
+            add(f"PENDING ({len(pending)})")
+            add("─" * 50)
             for o in unclaimed:
-                loc = ""
-                if o.get("file_path"):
-                    rel_path = _relative_path(o["file_path"], folders)
-                    row = o.get('row', 0) + 1
-                    sel = f" [{o['selection_length']}ch]" if o.get("selection_length") else ""
-                    loc = f" @ {rel_path}:{row}{sel}"
-                prompt = o['prompt'][:200] + ("..." if len(o['prompt']) > 200 else "")
-                lines.append(f"  [{o['id']}]{loc}  {prompt}")
+                loc = order_loc(o)
+                prompt = _trunc(o['prompt'], 200)
+                add(f"  [{o['id']}]{loc}  {prompt}")
             if claimed:
-                lines.append("")
-                lines.append(f"⏳ CLAIMED ({len(claimed)})")
+                add("")
+                add(f"⏳ CLAIMED ({len(claimed)})")
                 for o in claimed:
-                    loc = ""
-                    if o.get("file_path"):
-                        rel_path = _relative_path(o["file_path"], folders)
-                        row = o.get('row', 0) + 1
-                        sel = f" [{o['selection_length']}ch]" if o.get("selection_length") else ""
-                        loc = f" @ {rel_path}:{row}{sel}"
-                    prompt = o['prompt'][:150] + ("..." if len(o['prompt']) > 150 else "")
-                    lines.append(f"  ⏳ [{o['id']}]{loc}  {prompt} <- {o['claimed_by']}")
+                    loc = order_loc(o)
+                    prompt = _trunc(o['prompt'], 150)
+                    add(f"  ⏳ [{o['id']}]{loc}  {prompt} <- {o['claimed_by']}")
         else:
-            lines.append("No pending orders")
+            add("No pending orders")
 
-        lines.append("")
+        add("")
 
         if done:
-            lines.append(f"# DONE ({len(done)})")
+            add(f"# DONE ({len(done)})")
             for o in done[-5:]:
                 by = f" <- {o.get('done_by', '?')}" if o.get("done_by") else ""
-                prompt = o['prompt'][:150] + ("..." if len(o['prompt']) > 150 else "")
-                lines.append(f"#   [{o['id']}] {prompt}{by}")
+                prompt = _trunc(o['prompt'], 150)
+                add(f"#   [{o['id']}] {prompt}{by}")
             if len(done) > 5:
-                lines.append(f"#   ... and {len(done)-5} more")
+                add(f"#   ... and {len(done)-5} more")
 
         # Edits section
         edits = self.table.list_edits()
         grouped = self.view.settings().get("edits_grouped", False)
         if edits:
-            lines.append("")
+            add("")
             mode_indicator = "[grouped]" if grouped else "[by time]"
-            lines.append(f"📝 RECENT EDITS ({len(edits)}) {mode_indicator}")
-            lines.append("─" * 120)
+            add(f"📝 RECENT EDITS ({len(edits)}) {mode_indicator}")
+            add("─" * 120)
 
             if grouped:
                 # Group by file
@@ -561,13 +787,13 @@ class OrderTableView:
                                      reverse=True)
 
                 for file_path, file_edits in sorted_files[:8]:  # Top 8 files
-                    rel_path = _relative_path(file_path, folders)
+                    rel_path = _relative_to(file_path, prefixes)
                     if len(rel_path) > 70:
                         rel_path = "..." + rel_path[-67:]
                     agent_ids = set(e["agent_view_id"] for e in file_edits)
                     agent_str = ",".join(str(a) for a in agent_ids)
 
-                    lines.append(f"  {rel_path} [{agent_str}]")
+                    add(f"  {rel_path} [{agent_str}]")
 
                     # Show edits sorted by time (newest first)
                     for e in sorted(file_edits, key=lambda x: x["timestamp"], reverse=True)[:4]:
@@ -576,7 +802,7 @@ class OrderTableView:
                             delta += f"/-{e['lines_removed']}"
                         ago = _relative_time(e["timestamp"])
                         ctx = e.get("context", "")[:45]
-                        lines.append(f"    {rel_path}:{e['line_num']:<5} {delta:<8} {ago:<10} {ctx}")
+                        add(f"    {rel_path}:{e['line_num']:<5} {delta:<8} {ago:<10} {ctx}")
             else:
                 # Flat list sorted by time (newest first), merge same file:line
                 sorted_edits = sorted(edits, key=lambda x: x["timestamp"], reverse=True)
@@ -591,7 +817,7 @@ class OrderTableView:
                         merged_edits.append(e)
 
                 for e in merged_edits[:15]:
-                    rel_path = _relative_path(e["file_path"], folders)
+                    rel_path = _relative_to(e["file_path"], prefixes)
                     if len(rel_path) > 40:
                         rel_path = "..." + rel_path[-37:]
                     ago = _relative_time(e["timestamp"])
@@ -601,16 +827,24 @@ class OrderTableView:
                     ctx = e.get("context", "")[:40]
                     agent_id = e.get("agent_view_id", 0)
                     file_loc = f"{rel_path}:{e['line_num']}"
-                    lines.append(f"  {file_loc:<45} {delta:<8} {ago:<10} {ctx:<40} [{agent_id}]")
+                    add(f"  {file_loc:<45} {delta:<8} {ago:<10} {ctx:<40} [{agent_id}]")
 
-        lines.append("─" * 120)
-        lines.append("a add | Enter/g goto | o focus | q msg | c clear | C/Ctrl+C clear all | x clear done | t group")
+        add("─" * 120)
+        add("a add | Enter/g goto | o focus | q msg | c clear | C/Ctrl+C clear all | x clear done | t group")
 
-        content = "\n".join(lines)
+        # Rewrite only the changed lines; first render replaces the buffer
+        if self._last_lines is None:
+            args = ("claude_replace_content", {"content": "".join(l + "\n" for l in lines)})
+        else:
+            diff = _line_diff(self._last_lines, lines)
+            if diff is None:
+                return
+            start, end, text = diff
+            args = ("claude_replace", {"start": start, "end": end, "text": text})
+        self._last_lines = lines
 
-        # Update view content - replace entire buffer
         self.view.set_read_only(False)
-        self.view.run_command("claude_replace_content", {"content": content})
+        self.view.run_command(*args)
         self.view.set_read_only(True)
 
     def show(self):
@@ -622,6 +856,14 @@ class OrderTableView:
 _views: Dict[str, OrderTableView] = {}
 
 
+def _prune_stale():
+    """Drop wrappers for closed table views and tables of removed projects."""
+    for key in [k for k, w in _views.items() if not (w.view and w.view.is_valid())]:
+        del _views[key]
+    for root in [r for r, t in _tables.items() if not t._dirty and not os.path.isdir(r)]:
+        del _tables[root]
+
+
 def show_order_table(window) -> Optional[OrderTableView]:
     """Show the order table for window."""
     table = get_table(window)
@@ -633,6 +875,7 @@ def show_order_table(window) -> Optional[OrderTableView]:
 
     key = table.project_root
     if key not in _views or not _views[key].view.is_valid():
+        _prune_stale()
         _views[key] = OrderTableView(window, table)
     else:
         _views[key].refresh()
@@ -663,6 +906,7 @@ def refresh_order_table(window, reload_from_disk=False):
     for v in window.views():
         if v.settings().get("order_table_view"):
             # Create wrapper for existing view
+            _prune_stale()
             _views[key] = OrderTableView(window, table)
             sync_bookmarks(window)
             return
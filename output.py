@@ -10,6 +10,5 @@ from .output_models import (  # noqa: F401
 )
 from .output_view import OutputView  # noqa: F401
 from .output_cmds import (  # noqa: F401
-    ClaudeInsertCommand, ClaudeReplaceCommand,
     ClaudeClearAllCommand, ClaudeUndoClearCommand,
 )
@@ -3,17 +3,20 @@ import sublime
 import sublime_plugin
 
 
-class ClaudeInsertCommand(sublime_plugin.TextCommand):
-    """Insert text at position."""
-    def run(self, edit, pos: int, text: str):
-        self.view.insert(edit, pos, text)
-
-
-class ClaudeReplaceCommand(sublime_plugin.TextCommand):
-    """Replace region with text."""
-    def run(self, edit, start: int, end: int, text: str):
-        region = sublime.Region(start, end)
-        self.view.replace(edit, region, text)
+# The read-only-aware edit commands live in commands.text_cmds. Resolved on
+# first access: importing them here eagerly would cycle back through
+# core -> session -> output -> output_cmds.
+_TEXT_CMDS = (
+    "ClaudeInsertCommand", "ClaudeReplaceCommand", "ClaudeBatchEditCommand",
+    "_unlock_for_edit", "_leave_read_only",
+)
+
+
+def __getattr__(name):
+    if name in _TEXT_CMDS:
+        from .commands import text_cmds
+        return getattr(text_cmds, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class ClaudeClearAllCommand(sublime_plugin.TextCommand):
@@ -119,6 +119,8 @@ class ToolCall:
     status: str = PENDING  # pending, done, error, background
     result: Optional[str] = None  # tool result content
     id: Optional[str] = None  # tool_use_id, for precise matching
+    # (tool_input, key, detail) memo for OutputView._format_tool_detail
+    _rendered_detail: Optional[tuple] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -255,6 +257,58 @@ class Conversation:
     context_names: List[str] = field(default_factory=list)  # Context chip labels
     # Path-rich refs for click-to-focus: [{name, path, line_range, action}, ...]
     context_refs: List[dict] = field(default_factory=list)
+    # (prompt, indented) memo for indented_prompt
+    _rendered_prompt: Optional[tuple] = field(default=None, repr=False, compare=False)
+    # name -> pending ToolCalls in creation order (see last_pending)
+    _pending_by_name: Dict[str, list] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def indented_prompt(self) -> str:
+        """Prompt with continuation lines indented to align after ◎."""
+        cached = self._rendered_prompt
+        if cached is not None and cached[0] is self.prompt:
+            return cached[1]
+        text = self.prompt
+        if "\n" in text:
+            first, rest = text.split("\n", 1)
+            text = first + "\n  " + rest.replace("\n", "\n  ")
+        self._rendered_prompt = (self.prompt, text)
+        return text
+
+    def track_pending(self, tool: ToolCall) -> None:
+        """Index a pending tool so last_pending() can find it by name.
+
+        Stacks stay in event order: a tool re-tracked under a new name
+        (upsert rename) slots in below newer tools of that name.
+        """
+        stack = self._pending_by_name.setdefault(tool.name, [])
+        stack[:] = [t for t in stack if t is not tool]
+        if not stack or (self.events and self.events[-1] is tool):
+            stack.append(tool)
+            return
+        order = {id(e): i for i, e in enumerate(self.events)}
+        pos = order.get(id(tool), len(self.events))
+        i = len(stack)
+        while i and order.get(id(stack[i - 1]), -1) > pos:
+            i -= 1
+        stack.insert(i, tool)
+
+    def untrack(self, tool: ToolCall) -> None:
+        """Drop a tool removed from events from the pending index."""
+        stack = self._pending_by_name.get(tool.name)
+        if stack:
+            stack[:] = [t for t in stack if t is not tool]
+
+    def last_pending(self, name: str) -> Optional[ToolCall]:
+        """Newest still-pending tool called `name`. Entries that finished or
+        were renamed since tracking are dropped lazily."""
+        stack = self._pending_by_name.get(name)
+        while stack:
+            t = stack[-1]
+            if t.status == PENDING and t.name == name:
+                return t
+            stack.pop()
+        return None
 
     @property
     def tools(self) -> List[ToolCall]:
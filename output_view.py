@@ -1,7 +1,9 @@
 """Structured output view with region tracking."""
 import os
+import time
 import sublime
-from typing import List, Optional, Dict, Callable, Any
+from collections import deque
+from typing import Deque, List, Optional, Dict, Callable, Any
 
 from .constants import SPINNER_FRAMES, BACKEND_ABBREV, CONTEXT_PREFIX, BACKGROUND_PREFIX
 from .output_pending import clear_pending_block
@@ -13,6 +15,7 @@ from .output_models import (
     GoalState, Conversation,
     _open_todos, _goal_is_open,
     _todo_status_norm, _todo_is_active,
+    _TITLE_ICON_RE,
 )
 from .tool_formatters import (
     format_tool_detail,
@@ -22,6 +25,101 @@ from .tool_formatters import (
     is_image_path,
     is_video_path,
 )
+
+
+def _changed_span(old: str, new: str) -> tuple:
+    """(prefix, old_end, new_end): old[prefix:old_end] -> new[prefix:new_end]
+    is the smallest single edit turning old into new.
+
+    Streaming edits land near the tail (text before the spinner line), so
+    both searches gallop from there before bisecting: a few full-length
+    compares for the prefix, and suffix compares sized to the suffix.
+    """
+    n = min(len(old), len(new))
+    if old[:n] == new[:n]:
+        prefix = n
+    else:
+        hi, step = n, 1  # old[:hi] != new[:hi]
+        lo = n - 1
+        while lo > 0 and old[:lo] != new[:lo]:
+            hi, step = lo, step * 2
+            lo = max(0, hi - step)
+        while hi - lo > 1:  # old[:lo] == new[:lo]
+            mid = (lo + hi) // 2
+            if old[:mid] == new[:mid]:
+                lo = mid
+            else:
+                hi = mid
+        prefix = lo
+    # Common suffix, not overlapping the prefix
+    m = n - prefix
+    lo, k = 0, 1
+    while k <= m and old[len(old) - k:] == new[len(new) - k:]:
+        lo, k = k, k * 2
+    hi = min(k, m + 1)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            lo = mid
+        else:
+            hi = mid
+    return prefix, len(old) - lo, len(new) - lo
+
+
+# Permission prompt detail per tool: tool_input -> (display_tool, detail),
+# or None to fall back to the generic first-param line.
+def _perm_bash(tool_input: dict):
+    if "command" not in tool_input:
+        return None
+    cmd = tool_input["command"]
+    if len(cmd) > 80:
+        cmd = cmd[:80] + "..."
+    return "Bash", cmd
+
+
+def _perm_file(tool_input: dict):
+    return None, tool_input.get("file_path") or tool_input.get("description") or ""
+
+
+def _perm_pattern(tool_input: dict):
+    if "pattern" not in tool_input:
+        return None
+    return None, tool_input["pattern"]
+
+
+def _perm_skill(tool_input: dict):
+    if "skill" not in tool_input:
+        return None
+    # Show skill name as the tool name for better clarity
+    return f"Skill: {tool_input['skill']}", tool_input.get("args") or ""
+
+
+# Permission button region key and scope per button type (distinct colours).
+_PERM_BUTTON_REGION = {
+    btn: (f"claude_btn_{btn}", f"claude.permission.button.{btn}")
+    for btn in (PERM_ALLOW, PERM_DENY, PERM_ALLOW_SESSION, PERM_ALLOW_ALL)
+}
+
+# Fixed permission buttons: joined row + (type, start, end) offsets within it.
+# The [A] Always button carries a per-request hint and is laid out live.
+_PERM_BUTTON_ROW = "[Y] Allow  [N] Deny  [S] Allow 30s"
+_PERM_BUTTON_SPANS = tuple(
+    (btn, _PERM_BUTTON_ROW.index(label), _PERM_BUTTON_ROW.index(label) + len(label))
+    for btn, label in ((PERM_ALLOW, "[Y] Allow"), (PERM_DENY, "[N] Deny"),
+                       (PERM_ALLOW_SESSION, "[S] Allow 30s"))
+)
+
+_PERMISSION_DETAIL = {
+    "Bash": _perm_bash,
+    "Read": _perm_file,
+    "Edit": _perm_file,
+    "Write": _perm_file,
+    "Glob": _perm_pattern,
+    "Grep": _perm_pattern,
+    "Skill": _perm_skill,
+}
+
+
 class OutputView:
     """Structured output view - readonly, plugin-controlled."""
 
@@ -31,6 +129,9 @@ class OutputView:
         "error": "✘",
         "background": "⚙",
     }
+    _TOOL_PREFIX = {status: f"  {sym} " for status, sym in SYMBOLS.items()}
+
+    RENDER_DELAY_MS = 16  # coalesce stream events into ~one render per frame
 
     # Host/plumbing tools — tracked for lifecycle but never shown in the buffer.
     # Users should see the answer, not "☐ mcp__sublime__quick_done".
@@ -57,7 +158,7 @@ class OutputView:
         self.conversations: List[Conversation] = []
         self.current: Optional[Conversation] = None
         self.pending_permission: Optional[PermissionRequest] = None
-        self._permission_queue: List[PermissionRequest] = []  # Queue for multiple requests
+        self._permission_queue: Deque[PermissionRequest] = deque()  # Queue for multiple requests
         self.pending_plan: Optional[PlanApproval] = None
         self.pending_question: Optional[QuestionRequest] = None
         self.auto_allow_tools: set = self._load_persisted_auto_allow()  # Tools auto-allowed for this session
@@ -66,6 +167,10 @@ class OutputView:
         self._pending_context_region: tuple = (0, 0)  # Region for context display
         self._cleared_content: Optional[str] = None  # For undo clear
         self._render_pending: bool = False  # Debounce flag for rendering
+        # (conversation, start, text) last written by _do_render — lets the
+        # next frame patch only the changed span instead of the whole turn
+        self._rendered: Optional[tuple] = None
+        self._name_raw: Optional[str] = None  # last set_name() input
         # Inline input state
         self._input_mode: bool = False  # True when user can type in input region
         self._input_start: int = 0  # Start position of editable input region
@@ -168,11 +273,9 @@ class OutputView:
         """Update the output view title."""
         # Strip any leading status glyphs so they never accumulate in the stored
         # base name (e.g. a ↻/◇ prefix leaking back in → "◇ ↻ name").
-        import re
-        name = re.sub(
-            r'^(?:[◉◇•○◐◓◑◒❓⏸↻⚠✘❌!❗⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏]\s*)+', '', name or ""
-        ) or "Claude"
-        self._name = name  # Store for refresh_title
+        if name != self._name_raw:
+            self._name_raw = name
+            self._name = _TITLE_ICON_RE.sub('', name or "") or "Claude"  # Store for refresh_title
         self._update_title()
 
     def _update_title(self) -> None:
@@ -210,9 +313,8 @@ class OutputView:
             session and getattr(session, "error_halted", False) and not is_working
         )
         # ↻ = confirmed future wake only (clears when wake fires / expires).
-        import time as _t
         _nxt = getattr(session, "next_wake_at", None) if session else None
-        is_looping = bool(_nxt and _nxt > _t.time())
+        is_looping = bool(_nxt and _nxt > time.time())
         if is_sleeping:
             prefix = "⏸ "
         elif is_questioning:
@@ -304,40 +406,53 @@ class OutputView:
         # Leave a single trailing newline when there is prior content.
         self._replace(del_start, size, "\n" if del_start > 0 else "")
 
+    def _wants_read_only(self) -> bool:
+        # Sticky ◎ draft and AskUserQuestion free-text both use _input_mode.
+        # Leaving read_only=True after _write/_replace makes typing a no-op.
+        return not (self._input_mode or getattr(self, "_question_input_mode", False))
+
     def _finish_buffer_edit(self) -> None:
         """After plugin buffer writes: keep typeable zones editable."""
         if not self.view or not self.view.is_valid():
             return
-        # Sticky ◎ draft and AskUserQuestion free-text both use _input_mode.
-        # Leaving read_only=True after _write/_replace makes typing a no-op.
-        if self._input_mode or getattr(self, "_question_input_mode", False):
-            self.view.set_read_only(False)
-        else:
-            self.view.set_read_only(True)
+        self.view.set_read_only(self._wants_read_only())
 
     def _write(self, text: str, pos: Optional[int] = None) -> int:
-        """Write text at position (or end). Returns end position."""
+        """Write text at position (or end). Returns end position.
+
+        The command unlocks the view for the edit and leaves it in the
+        read-only state _finish_buffer_edit would pick.
+        """
         if not self.view or not self.view.is_valid():
             return 0
 
-        self.view.set_read_only(False)
         if pos is None:
             pos = self.view.size()
-        self.view.run_command("claude_insert", {"pos": pos, "text": text})
-        self._finish_buffer_edit()
+        self.view.run_command("claude_insert", {
+            "pos": pos, "text": text, "read_only": self._wants_read_only(),
+        })
         return pos + len(text)
 
     def _replace(self, start: int, end: int, text: str) -> int:
         """Replace [start, end) with text. Returns new end (= start + len(text))."""
         if not self.view or not self.view.is_valid():
             return end
-        self.view.set_read_only(False)
+        self._rendered = None
         self.view.run_command("claude_replace", {
             "start": start, "end": end, "text": text,
+            "read_only": self._wants_read_only(),
         })
-        self._finish_buffer_edit()
         return start + len(text)
 
+    def _batch_replace(self, ops: list) -> None:
+        """Apply several (start, end, text) replacements as one edit/undo step."""
+        if not ops or not self.view or not self.view.is_valid():
+            return
+        self._rendered = None
+        self.view.run_command("claude_batch_edit", {
+            "ops": ops, "read_only": self._wants_read_only(),
+        })
+
     def _is_following_tail(self, slack: int = 120) -> bool:
         """True if the visible bottom is near the buffer end (user following stream)."""
         if not self.view or not self.view.is_valid():
@@ -568,8 +683,10 @@ class OutputView:
                 return
             _x, y = self.view.text_to_layout(end)
             vh = float(self.view.viewport_extent()[1])
-            vx, _vy = self.view.viewport_position()
+            vx, vy = self.view.viewport_position()
             target_y = max(0.0, float(y) + float(self.view.line_height() or 16) - vh)
+            if abs(float(vy) - target_y) < 0.5:
+                return  # already pinned — skip a redundant viewport update
             self.view.set_viewport_position((float(vx), target_y), False)
         except Exception:
             pass
@@ -692,6 +809,7 @@ class OutputView:
             if cleanup_start >= 0 and cleanup_start < self.view.size():
                 # print(f"[Claude] enter_input_mode: CLEANUP deleting from {cleanup_start} to {self.view.size()}")
                 self.view.set_read_only(False)
+                self._rendered = None
                 self.view.run_command("claude_replace", {
                     "start": cleanup_start,
                     "end": self.view.size(),
@@ -709,7 +827,7 @@ class OutputView:
         # Clear any existing context region since we'll render it with input
         # print(f"[Claude] enter_input_mode: _pending_context_region={self._pending_context_region}")
         if self._pending_context_region[1] > self._pending_context_region[0]:
-            # print(f"[Claude] enter_input_mode: clearing old context region")
+            # print("[Claude] enter_input_mode: clearing old context region")
             self._replace(self._pending_context_region[0], self._pending_context_region[1], "")
             self._pending_context_region = (0, 0)
             # _replace sets view to read-only, so set it back to False for append operations
@@ -806,6 +924,7 @@ class OutputView:
             start = getattr(self, '_input_area_start', self._input_start - len(self._input_marker))
             if start > 0:
                 start -= 1  # Include preceding newline
+            self._rendered = None
             self.view.run_command("claude_replace", {
                 "start": max(0, start),
                 "end": self.view.size(),
@@ -855,6 +974,7 @@ class OutputView:
                 return  # real draft (multi-line ok)
             # Whitespace / bare newlines only — wipe so buffer ends on ◎ line
             self.view.set_read_only(False)
+            self._rendered = None
             self.view.run_command("claude_replace", {
                 "start": start, "end": end, "text": "",
             })
@@ -1002,6 +1122,7 @@ class OutputView:
         if not body.strip():
             body = ""
         self.view.set_read_only(False)
+        self._rendered = None
         self.view.run_command("claude_replace", {
             "start": self._input_start,
             "end": self.view.size(),
@@ -1284,6 +1405,7 @@ class OutputView:
         except Exception:
             pass
 
+        self._rendered = None
         OutputView.strip_composer_tail(self.view)
         # Spare newlines under transcript (composer void) — sleep/restore
         OutputView.collapse_trailing_blank_lines(self.view, keep=1)
@@ -1310,7 +1432,7 @@ class OutputView:
         """Show pending context - integrated with input mode if active."""
         # print(f"[Claude] set_pending_context: called with {len(context_items)} items, _input_mode={self._input_mode}")
         if not self.view or not self.view.is_valid():
-            # print(f"[Claude] set_pending_context: view invalid, returning")
+            # print("[Claude] set_pending_context: view invalid, returning")
             return
 
         # If in input mode, re-render the whole input area with new context
@@ -1333,16 +1455,16 @@ class OutputView:
             return
 
         # Not in input mode - show context at end of view
-        # print(f"[Claude] set_pending_context: not in input mode, showing at end")
+        # print("[Claude] set_pending_context: not in input mode, showing at end")
         # Remove old context display
         start, end = self._pending_context_region
         # print(f"[Claude] set_pending_context: old region ({start}, {end})")
         if end > start:
-            # print(f"[Claude] set_pending_context: removing old context display")
+            # print("[Claude] set_pending_context: removing old context display")
             self._replace(start, end, "")
 
         if not context_items:
-            # print(f"[Claude] set_pending_context: no items, clearing region")
+            # print("[Claude] set_pending_context: no items, clearing region")
             self._pending_context_region = (0, 0)
             self._refresh_context_phantoms([])
             return
@@ -1350,7 +1472,7 @@ class OutputView:
         # Anchor only (📎); clickable names/actions are the inline phantom.
         text = f"\n{CONTEXT_PREFIX}\n"
         start = self.view.size()
-        end = self._write(text)
+        end = self._write(text, pos=start)
         self._pending_context_region = (start, end)
         self._scroll_to_end()
         sublime.set_timeout(
@@ -1463,17 +1585,12 @@ class OutputView:
         # Buffer keeps only 📎; names are clickable phantoms (same as pending chips).
         start = self.view.size()
         prefix = "\n" if start > 0 else ""
-        # Indent continuation lines to align with first line after ◎
-        lines = text.split("\n")
-        if len(lines) > 1:
-            indented = lines[0] + "\n" + "\n".join("  " + l for l in lines[1:])
-        else:
-            indented = text
+        indented = self.current.indented_prompt
         if names or refs:
             line = f"{prefix}◎ {indented} ▶\n  {CONTEXT_PREFIX}\n"
         else:
             line = f"{prefix}◎ {indented} ▶\n"
-        end = self._write(line)
+        end = self._write(line, pos=start)
         self.current.region = (start, end)
         # Track with Sublime region so it auto-adjusts when view content shifts
         self.view.add_regions(
@@ -1505,7 +1622,10 @@ class OutputView:
         if tool_id:
             existing = self._find_pending_or_background_by_id(tool_id)
             if existing is not None and existing.status in (PENDING, BACKGROUND):
-                existing.name = name
+                if existing.name != name:
+                    existing.name = name
+                    if existing.status == PENDING and self._is_in_current(existing):
+                        self.current.track_pending(existing)
                 if tool_input:
                     existing.tool_input = tool_input
                 if background:
@@ -1516,10 +1636,12 @@ class OutputView:
                 tool_call = ToolCall(
                     name=name, tool_input=tool_input, status=status, id=tool_id)
                 self.current.events.append(tool_call)
+                self.current.track_pending(tool_call)
         else:
             tool_call = ToolCall(
                 name=name, tool_input=tool_input, status=status, id=tool_id)
             self.current.events.append(tool_call)
+            self.current.track_pending(tool_call)
 
         # Capture TodoWrite state (Claude/Grok full snapshot; Kimi uses title/done).
         if name == "TodoWrite" or (
@@ -1716,6 +1838,7 @@ class OutputView:
             m = re.search(re.escape(prefix), content)
         if m is not None:
             self._replace(m.start() + 2, m.start() + 2 + len(old_sym), new_sym)
+            self._rendered = None
 
     def remove_tool(self, target: ToolCall) -> None:
         """Drop a tool entirely — from its conversation's events and, for an
@@ -1730,6 +1853,7 @@ class OutputView:
             for i, e in enumerate(conv.events):
                 if e is target:  # identity, not dataclass __eq__
                     del conv.events[i]
+                    conv.untrack(target)
                     in_current = (conv is self.current)
                     break
             else:
@@ -1759,6 +1883,7 @@ class OutputView:
         line_region = self.view.line(m.start())
         end = min(line_region.end() + 1, self.view.size())  # include trailing newline
         self._replace(line_region.begin(), end, "")
+        self._rendered = None
 
     def tool_done(self, name: str, result: str = None, tool_id: str = None) -> None:
         """Mark tool as done. Prefer tool_id match, fall back to name+PENDING.
@@ -1774,11 +1899,7 @@ class OutputView:
         if not targets:
             target = self._find_pending_or_background_by_id(tool_id)
             if target is None and self.current:
-                for event in reversed(self.current.events):
-                    if (isinstance(event, ToolCall) and event.name == name
-                            and event.status == PENDING):
-                        target = event
-                        break
+                target = self.current.last_pending(name)
             if target is not None:
                 targets = [target]
         if not targets:
@@ -1984,10 +2105,7 @@ class OutputView:
         """Mark tool as error. Prefer tool_id match, fall back to name+PENDING."""
         target = self._find_pending_or_background_by_id(tool_id)
         if target is None and self.current:
-            for event in reversed(self.current.events):
-                if isinstance(event, ToolCall) and event.name == name and event.status == PENDING:
-                    target = event
-                    break
+            target = self.current.last_pending(name)
         if target is None:
             if self.current:
                 self.current.events.append(ToolCall(name=name, tool_input={}, status=ERROR, result=result, id=tool_id))
@@ -2008,11 +2126,16 @@ class OutputView:
         if content is None or content == "":
             return
 
-        # Merge with previous text event to avoid per-token line breaks
-        if self.current.events and isinstance(self.current.events[-1], str):
-            self.current.events[-1] += content
+        # Merge with previous text event to avoid per-token line breaks.
+        # Pop first so the tail is singly referenced and += can grow it in
+        # place — `events[-1] += content` copies the whole reply per token.
+        events = self.current.events
+        if events and isinstance(events[-1], str):
+            tail = events.pop()
+            tail += content
+            events.append(tail)
         else:
-            self.current.events.append(content)
+            events.append(content)
         # Re-arm spinner only while the *session* is mid-query. After interrupt
         # the bridge can still drip 1–2 lines — must not flip working=True again
         # (that killed ◎: busy mark then idle with no input).
@@ -2078,6 +2201,20 @@ class OutputView:
             self.current.events.append("\n\n*[interrupted]*\n")
         self._render_current()
 
+    def _clear_buffer(self) -> None:
+        """Erase the buffer, keeping one snapshot for undo_clear.
+
+        Native undo can't stand in for the snapshot: clear() re-renders
+        carry-forward UI right after the erase, and the spinner periodically
+        drops the undo stack.
+        """
+        size = self.view.size()
+        if size:
+            self._cleared_content = self.view.substr(sublime.Region(0, size))
+            self.view.set_read_only(False)
+            self.view.run_command("claude_clear_all")
+            self.view.set_read_only(True)
+
     def clear(self) -> None:
         """Clear all output (can undo with Cmd+Z).
 
@@ -2121,11 +2258,7 @@ class OutputView:
         if self._input_mode:
             self.exit_input_mode(keep_text=False)
         if self.view and self.view.is_valid():
-            # Save content for undo
-            self._cleared_content = self.view.substr(sublime.Region(0, self.view.size()))
-            self.view.set_read_only(False)
-            self.view.run_command("claude_clear_all")
-            self.view.set_read_only(True)
+            self._clear_buffer()
             # Reset view settings that might be stale from old session
             self.view.settings().set("claude_input_mode", False)
         self.conversations = []
@@ -2219,10 +2352,7 @@ class OutputView:
             self.exit_input_mode(keep_text=False)
 
         if self.view and self.view.is_valid():
-            self._cleared_content = self.view.substr(sublime.Region(0, self.view.size()))
-            self.view.set_read_only(False)
-            self.view.run_command("claude_clear_all")
-            self.view.set_read_only(True)
+            self._clear_buffer()
             self.view.settings().set("claude_input_mode", False)
             try:
                 self.view.erase_regions("claude_conversation")
@@ -2243,6 +2373,7 @@ class OutputView:
         self._input_start = 0
         self._input_area_start = 0
         self._render_pending = False
+        self._rendered = None
 
         # Paint kept round at top of empty buffer
         self._auto_scroll = True
@@ -2342,14 +2473,10 @@ class OutputView:
                 sym_end = sym_start + len(bg_sym)
                 edits.append((sym_start, sym_end))
                 idx = pos + len(marker)
-            # Apply right-to-left so earlier offsets stay valid
+            # One edit; the batch command applies right-to-left
             if edits:
-                self.view.set_read_only(False)
-                for sym_start, sym_end in reversed(edits):
-                    self.view.run_command("claude_replace", {
-                        "start": sym_start, "end": sym_end, "text": err_sym,
-                    })
-                self.view.set_read_only(True)
+                self._rendered = None  # patches may land inside the live turn
+                self._batch_replace([(a, b, err_sym) for a, b in edits])
 
     def _remove_permission_block(self) -> None:
         """Remove permission block from view without callback."""
@@ -2396,7 +2523,6 @@ class OutputView:
 
     def permission_request(self, pid: int, tool: str, tool_input: dict, callback: Callable[[str], None]) -> None:
         """Show a permission request in the view."""
-        import time
         self.show(focus=False)  # Don't steal focus from other views
 
         # NOTE: Don't call clear_stale_permission here - concurrent permissions are valid
@@ -2427,7 +2553,9 @@ class OutputView:
             self._permission_queue.append(perm)
             return
 
-        # Show this one — hide sticky ◎ so choice UI owns the tail
+        # Show this one — hide sticky ◎ so choice UI owns the tail.
+        # Land any queued turn render first so the block doesn't jump down.
+        self._flush_render()
         self.pending_permission = perm
         self.hide_composer_for_modal()
         self._render_permission()
@@ -2445,28 +2573,16 @@ class OutputView:
         # Format tool details and display name
         detail = ""
         display_tool = tool
-        if tool == "Bash" and "command" in tool_input:
-            cmd = tool_input["command"]
-            if len(cmd) > 80:
-                cmd = cmd[:80] + "..."
-            detail = cmd
-        elif tool in ("Read", "Edit", "Write"):
-            detail = tool_input.get("file_path") or tool_input.get("description") or ""
-        elif tool == "Glob" and "pattern" in tool_input:
-            detail = tool_input["pattern"]
-        elif tool == "Grep" and "pattern" in tool_input:
-            detail = tool_input["pattern"]
-        elif tool == "Skill" and "skill" in tool_input:
-            # Show skill name as the tool name for better clarity
-            skill_name = tool_input["skill"]
-            display_tool = f"Skill: {skill_name}"
-            # Show args if present
-            if "args" in tool_input and tool_input["args"]:
-                detail = tool_input["args"]
+        fmt = _PERMISSION_DETAIL.get(tool)
+        shown = fmt(tool_input) if fmt is not None else None
+        if shown is not None:
+            display_tool = shown[0] or tool
+            detail = shown[1]
         else:
             # Generic: show first param
-            for k, v in list(tool_input.items())[:1]:
-                detail = f"{k}: {str(v)[:60]}"
+            first = next(iter(tool_input.items()), None)
+            if first is not None:
+                detail = f"{first[0]}: {str(first[1])[:60]}"
 
         # Build permission block
         lines = [
@@ -2479,7 +2595,7 @@ class OutputView:
         lines.append("    ")
 
         # Track button positions relative to block start
-        text_before_buttons = "".join(lines)
+        buttons_at = sum(map(len, lines))
 
         # Check if this is a dangerous command that shouldn't have "Always allow"
         hide_always = False
@@ -2494,11 +2610,6 @@ class OutputView:
             if any(pattern in cmd for pattern in dangerous_patterns):
                 hide_always = True
 
-        # Buttons
-        btn_y = "[Y] Allow"
-        btn_n = "[N] Deny"
-        btn_s = "[S] Allow 30s"
-
         # Create descriptive "Always" button based on what pattern will be saved
         always_hint = ""
         if tool == "Bash" and "command" in tool_input:
@@ -2517,11 +2628,7 @@ class OutputView:
                 always_hint = f" in `{dir_path}/`"
         btn_a = f"[A] Always{always_hint}"
 
-        lines.append(btn_y)
-        lines.append("  ")
-        lines.append(btn_n)
-        lines.append("  ")
-        lines.append(btn_s)
+        lines.append(_PERM_BUTTON_ROW)
         if not hide_always:
             lines.append("  ")
             lines.append(btn_a)
@@ -2533,7 +2640,7 @@ class OutputView:
 
         # Write to view
         start = self.view.size()
-        end = self._write(text)
+        end = self._write(text, pos=start)
         perm.region = (start, end)
 
         # Add tracked region for the whole permission block (auto-adjusts when text shifts)
@@ -2546,14 +2653,11 @@ class OutputView:
         )
 
         # Calculate button regions (absolute positions)
-        btn_start = start + len(text_before_buttons)
-        perm.button_regions[PERM_ALLOW] = (btn_start, btn_start + len(btn_y))
-        btn_start += len(btn_y) + 2  # +2 for "  "
-        perm.button_regions[PERM_DENY] = (btn_start, btn_start + len(btn_n))
-        btn_start += len(btn_n) + 2
-        perm.button_regions[PERM_ALLOW_SESSION] = (btn_start, btn_start + len(btn_s))
-        btn_start += len(btn_s) + 2
+        btn_start = start + buttons_at
+        for btn_type, a, b in _PERM_BUTTON_SPANS:
+            perm.button_regions[btn_type] = (btn_start + a, btn_start + b)
         if not hide_always:
+            btn_start += len(_PERM_BUTTON_ROW) + 2  # +2 for "  "
             perm.button_regions[PERM_ALLOW_ALL] = (btn_start, btn_start + len(btn_a))
 
         # Add regions for highlighting
@@ -2565,15 +2669,15 @@ class OutputView:
             return
 
         perm = self.pending_permission
-        for btn_type, (start, end) in perm.button_regions.items():
-            region_key = f"claude_btn_{btn_type}"
-            self.view.add_regions(
-                region_key,
-                [sublime.Region(start, end)],
-                f"claude.permission.button.{btn_type}",
-                "",
-                sublime.DRAW_NO_OUTLINE,
-            )
+        buttons = [
+            (_PERM_BUTTON_REGION.get(btn_type)
+             or (f"claude_btn_{btn_type}", f"claude.permission.button.{btn_type}"),
+             sublime.Region(start, end))
+            for btn_type, (start, end) in perm.button_regions.items()
+        ]
+        add_regions = self.view.add_regions
+        for (region_key, scope), region in buttons:
+            add_regions(region_key, [region], scope, "", sublime.DRAW_NO_OUTLINE)
 
     def _clear_permission(self) -> None:
         """Remove permission block from view (but keep pending_permission for same-tool detection)."""
@@ -2737,7 +2841,6 @@ class OutputView:
 
     def _respond_permission_with_callback(self, response: str, callback, tool: str, tool_input: dict = None) -> None:
         """Respond to a permission request with given callback."""
-        import time
 
         # Handle "allow all" - save to project settings and remember for this session.
         # Keep PERM_ALLOW_ALL on the callback so ACP bridges can map to allow_always.
@@ -2841,10 +2944,9 @@ class OutputView:
 
     def _process_permission_queue(self) -> None:
         """Process the next permission request in queue."""
-        import time
 
         while self._permission_queue:
-            perm = self._permission_queue.pop(0)
+            perm = self._permission_queue.popleft()
 
             # Check if auto-allowed now (user may have clicked "Always" or "30s")
             auto_allowed = False
@@ -2958,7 +3060,7 @@ class OutputView:
 
         # Write to view
         start = self.view.size()
-        end = self._write(text)
+        end = self._write(text, pos=start)
         plan.region = (start, end)
 
         # Track region
@@ -3473,6 +3575,7 @@ class OutputView:
         self.view.settings().set("claude_question_input_mode", False)
 
         self.view.set_read_only(False)
+        self._rendered = None
         self.view.run_command("claude_replace", {
             "start": erase_start,
             "end": self.view.size(),
@@ -3500,7 +3603,13 @@ class OutputView:
             return
         self._render_pending = True
         self._auto_scroll = auto_scroll  # Store for _do_render
-        sublime.set_timeout(self._do_render, 10)
+        sublime.set_timeout(self._flush_render, self.RENDER_DELAY_MS)
+
+    def _flush_render(self) -> None:
+        """Debounce tick. No-op if a sync render (meta/prompt/...) already ran
+        and cleared _render_pending — avoids a redundant second frame."""
+        if self._render_pending:
+            self._do_render()
 
     def advance_spinner(self, frames: str = None) -> None:
         """Advance spinner animation frame and re-render if working.
@@ -3660,12 +3769,7 @@ class OutputView:
         # Skip prompt header for carry-forward conversations (empty prompt)
         # used by clear() to keep todos / bg tools visible without a fake "◎ ▶".
         if self.current.prompt:
-            # Indent continuation lines
-            prompt_lines = self.current.prompt.split("\n")
-            if len(prompt_lines) > 1:
-                indented_prompt = prompt_lines[0] + "\n" + "\n".join("  " + l for l in prompt_lines[1:])
-            else:
-                indented_prompt = self.current.prompt
+            indented_prompt = self.current.indented_prompt
             # Include context indicator if present
             if self.current.context_names or self.current.context_refs:
                 # Names live in clickable phantoms (see _refresh_turn_context_phantoms)
@@ -3685,23 +3789,22 @@ class OutputView:
             while i < n_ev:
                 event = evs[i]
                 if isinstance(event, str):
-                    parts = [event]
-                    i += 1
+                    last = ""
                     while i < n_ev and isinstance(evs[i], str):
-                        parts.append(evs[i])
+                        if evs[i]:
+                            last = evs[i]
+                            lines.append(last)
                         i += 1
-                    block = "".join(parts)
-                    if block:
-                        lines.append(block)
-                        if not block.endswith("\n"):
-                            lines.append("\n")
+                    if last and last[-1] != "\n":
+                        lines.append("\n")
                     continue
                 if isinstance(event, ToolCall):
                     # Host control (e.g. quick_done) — never show plumbing
                     if not self.is_host_control_tool(event.name):
-                        symbol = self.SYMBOLS[event.status]
-                        detail = self._format_tool_detail(event)
-                        lines.append(f"  {symbol} {event.name}{detail}\n")
+                        lines.append(self._TOOL_PREFIX[event.status])
+                        lines.append(event.name)
+                        lines.append(self._format_tool_detail(event))
+                        lines.append("\n")
                 i += 1
 
         # Adaptive Work strip: Goal (◆) + Tasks (▸/○), then spinner.
@@ -3957,7 +4060,18 @@ class OutputView:
             pass
 
         old_end = end
-        new_end = self._replace(start, end, text)
+        cached = self._rendered
+        if (cached and cached[0] is self.current and cached[1] == start
+                and len(cached[2]) == end - start):
+            if text != cached[2]:
+                a, b, c = _changed_span(cached[2], text)
+                self._replace(start + a, start + b, text[a:c])
+            else:  # identical frame: leave the buffer (and undo stack) alone
+                self._finish_buffer_edit()
+            new_end = start + len(text)
+        else:
+            new_end = self._replace(start, end, text)
+        self._rendered = (self.current, start, text)
         delta = new_end - old_end
         self.current.region = (start, new_end)
         self.view.add_regions(
@@ -4131,8 +4245,21 @@ class OutputView:
             pass
 
     def _format_tool_detail(self, tool: ToolCall) -> str:
-        """Format tool detail string. Dispatches via TOOL_FORMATTERS registry."""
-        return format_tool_detail(self, tool)
+        """Format tool detail string. Dispatches via TOOL_FORMATTERS registry.
+
+        Memoized on the ToolCall until its name, status, result or
+        tool_input (same dict object + key count) changes. The memo holds
+        the dict itself so a replaced tool_input can't alias by id().
+        """
+        inp = tool.tool_input
+        key = (tool.name, tool.status, tool.result,
+               len(inp) if isinstance(inp, dict) else 0)
+        cached = tool._rendered_detail
+        if cached is not None and cached[0] is inp and cached[1] == key:
+            return cached[2]
+        detail = format_tool_detail(self, tool)
+        tool._rendered_detail = (inp, key, detail)
+        return detail
 
     def _format_x_search_result(self, result: str) -> str:
         """Compact summary for X/Twitter tool results."""
@@ -4958,6 +5085,7 @@ class OutputView:
         if label in old and old.strip() != CONTEXT_PREFIX.strip():
             return
         self._replace(start, end, new_line)
+        self._rendered = None
         # Region end shifts if label length differs from bare 📎 line
         try:
             delta = len(new_line) - (end - start)
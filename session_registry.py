@@ -9,14 +9,14 @@ view and in sessions.json). Registry maps:
 """
 from __future__ import annotations
 
-import uuid
+import secrets
 from typing import Optional, Any, List
 
 import sublime
 
 
 def new_agent_id() -> str:
-    return f"agent-{uuid.uuid4().hex[:12]}"
+    return f"agent-{secrets.token_hex(6)}"
 
 
 def ensure_registries() -> None:
@@ -239,7 +239,7 @@ def register_subsession_wait(
     import time
     waits = ensure_waits()
     key = str(child_id).strip()
-    wid = f"wait-{uuid.uuid4().hex[:10]}"
+    wid = f"wait-{secrets.token_hex(5)}"
     entry = {
         "wait_id": wid,
         "child_id": key,
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""Offline tests for OrderTable persistence + list() bookkeeping.
+
+Run:  python3 tests/test_order_table.py
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import types
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_order_table():
+    timers = []
+    sublime = types.ModuleType("sublime")
+    sublime.Region = lambda *a, **k: (a, k)
+    sublime.PERSISTENT = 1
+    sublime.DRAW_NO_FILL = 2
+    sublime.HIDDEN = 4
+    sublime.LAYOUT_BELOW = 2
+    sublime.active_window = lambda: None
+    sublime.set_timeout = lambda f, t=0: timers.append(f)
+    sublime.set_timeout_async = lambda f, t=0: timers.append(f)
+    sublime._claude_sessions = {}
+    sys.modules["sublime"] = sublime
+
+    pkg = types.ModuleType("otpkg")
+    pkg.__path__ = [ROOT]
+    sys.modules["otpkg"] = pkg
+
+    injected = []
+    notalone = types.ModuleType("otpkg.notalone")
+    notalone.inject_local = lambda vid, prompt, ctx=None: injected.append((vid, prompt, ctx))
+    sys.modules["otpkg.notalone"] = notalone
+
+    sys.modules.pop("otpkg.order_table", None)
+    mod = importlib.import_module("otpkg.order_table")
+    return mod, timers, injected
+
+
+def _run_timers(timers):
+    while timers:
+        timers.pop(0)()
+
+
+class TestOrderTable(unittest.TestCase):
+    def setUp(self):
+        self.ot, self.timers, self.injected = _load_order_table()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read_file(self):
+        with open(os.path.join(self.root, ".claude", "orders.json")) as f:
+            return json.load(f)
+
+    def test_saves_are_coalesced(self):
+        t = self.ot.OrderTable(self.root)
+        t.add("one")
+        t.add("two")
+        t.complete("order_1", "agent")
+        self.assertEqual([f.__name__ for f in self.timers].count("flush"), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.root, ".claude", "orders.json")))
+        _run_timers(self.timers)
+        data = self._read_file()
+        self.assertEqual(data["counter"], 2)
+        self.assertEqual({o["id"]: o["state"] for o in data["orders"]},
+                         {"order_1": "done", "order_2": "pending"})
+
+    def test_round_trip(self):
+        t = self.ot.OrderTable(self.root)
+        t.add("fix it", file_path="/p/a.py", row=3, col=1)
+        t.add_edit("agent", 7, "/p/a.py", 4, 2, 1, "Edit", "ctx")
+        t.flush()
+        t2 = self.ot.OrderTable(self.root)
+        orders = t2.list()
+        self.assertEqual(len(orders), 1)
+        self.assertEqual(orders[0]["prompt"], "fix it")
+        self.assertEqual(orders[0]["row"], 3)
+        self.assertEqual(t2.list_edits()[0]["context"], "ctx")
+
+    def test_list_by_state_in_creation_order(self):
+        t = self.ot.OrderTable(self.root)
+        for p in ("a", "b", "c"):
+            t.add(p)
+        t.complete("order_2")
+        self.assertEqual([o["id"] for o in t.list("pending")], ["order_1", "order_3"])
+        self.assertEqual([o["id"] for o in t.list("done")], ["order_2"])
+        self.assertEqual([o["id"] for o in t.list()], ["order_1", "order_2", "order_3"])
+
+    def test_undo_restores_creation_order(self):
+        t = self.ot.OrderTable(self.root)
+        for p in ("a", "b", "c"):
+            t.add(p)
+        t._orders["order_1"].created_at -= 2
+        t._orders["order_2"].created_at -= 1
+        t.delete("order_2")
+        t.undo_delete()
+        self.assertEqual([o["id"] for o in t.list("pending")], ["order_1", "order_2", "order_3"])
+        t.complete("order_3")
+        t.complete("order_1")
+        self.assertEqual([o["id"] for o in t.list("done")], ["order_1", "order_3"])
+
+    def test_done_orders_bounded(self):
+        t = self.ot.OrderTable(self.root)
+        n = self.ot.DONE_RETENTION + 3
+        for i in range(n):
+            t.add(str(i))
+            t._orders[f"order_{i + 1}"].created_at = i
+            t.complete(f"order_{i + 1}")
+        done = t.list("done")
+        self.assertEqual(len(done), self.ot.DONE_RETENTION)
+        self.assertEqual(done[0]["id"], "order_4")
+        self.assertEqual(len(t._orders), self.ot.DONE_RETENTION)
+
+    def test_completing_older_order_keeps_it(self):
+        t = self.ot.OrderTable(self.root)
+        t.add("old")
+        t._orders["order_1"].created_at = 0
+        for i in range(self.ot.DONE_RETENTION):
+            t.add(str(i))
+            oid = f"order_{i + 2}"
+            t._orders[oid].created_at = i + 1
+            t.complete(oid)
+            t._orders[oid].done_at = i + 1
+        self.assertEqual(t.complete("order_1"), (True, "Done"))
+        done = [o["id"] for o in t.list("done")]
+        self.assertIn("order_1", done)
+        self.assertNotIn("order_2", done)  # earliest completed is evicted
+        self.assertEqual(len(done), self.ot.DONE_RETENTION)
+
+    def test_list_reflects_mutations(self):
+        t = self.ot.OrderTable(self.root)
+        t.add("a")
+        first = t.list("pending")
+        first.clear()  # callers may mutate the returned list
+        self.assertEqual(len(t.list("pending")), 1)
+        t.claim("order_1", "agent")
+        self.assertEqual(t.list("pending")[0]["claimed_by"], "agent")
+        t.delete("order_1")
+        self.assertEqual(t.list("pending"), [])
+        t.undo_delete()
+        self.assertEqual([o["id"] for o in t.list("pending")], ["order_1"])
+        t.complete("order_1")
+        self.assertEqual(t.clear_done(), 1)
+        self.assertEqual(t.list(), [])
+
+    def test_reload_skips_unchanged_file(self):
+        t = self.ot.OrderTable(self.root)
+        t.add("a")
+        t.flush()
+        version = t._version
+        t._load()
+        self.assertEqual(t._version, version)
+        data = self._read_file()
+        data["orders"][0]["prompt"] = "changed externally"
+        with open(t.orders_file, "w") as f:
+            json.dump(data, f)
+        t._load()
+        self.assertGreater(t._version, version)
+        self.assertEqual(t.list()[0]["prompt"], "changed externally")
+
+    def test_to_dict_covers_all_fields(self):
+        from dataclasses import asdict
+        order = self.ot.Order(id="x", prompt="p", file_path="/a", row=1, selection_length=3)
+        self.assertEqual(order.to_dict(), asdict(order))
+
+    def test_subscribers_notified(self):
+        t = self.ot.OrderTable(self.root)
+        self.ot.subscribe_to_orders(self.root, 5, "New {context[order_id]}")
+        self.ot.subscribe_to_orders(self.root, 5, "Again {context[order_id]}")
+        self.ot.subscribe_to_orders(self.root, 6, "plain")
+        self.ot.subscribe_to_orders(self.root, 7, "bad {context[nope]}")
+        self.ot.subscribe_to_orders(self.root, 8, "escaped }}")
+        t.add("x")
+        self.assertEqual(sorted((v, p) for v, p, _ in self.injected),
+                         [(5, "Again order_1"), (6, "plain"),
+                          (7, "bad {context[nope]}"), (8, "escaped }")])
+
+
+class _FakeView:
+    def __init__(self, name):
+        self.name = name
+        self.regions = {}
+        self.file_name_calls = 0
+
+    def file_name(self):
+        self.file_name_calls += 1
+        return self.name
+
+    def text_point(self, row, col):
+        return row * 100 + col
+
+    def add_regions(self, key, regions, *args):
+        self.regions[key] = regions
+
+    def erase_regions(self, key):
+        self.regions.pop(key, None)
+
+    def add_phantom(self, *args):
+        pass
+
+    def erase_phantoms(self, key):
+        pass
+
+
+class _FakeWindow:
+    def __init__(self, root, views):
+        self.root = root
+        self._views = views
+
+    def folders(self):
+        return [self.root]
+
+    def views(self):
+        return list(self._views)
+
+
+class TestSyncBookmarks(unittest.TestCase):
+    def setUp(self):
+        self.ot, _, _ = _load_order_table()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_regions_added_to_first_matching_view(self):
+        t = self.ot.get_table_for_cwd(self.root)
+        t.add("a", file_path="/p/a.py", row=1)
+        t.add("b", file_path="/p/a.py", row=2)
+        t.add("c", file_path="/p/b.py", row=0)
+        t.add("d")
+        a1, a2, other = _FakeView("/p/a.py"), _FakeView("/p/a.py"), _FakeView(None)
+        self.ot.sync_bookmarks(_FakeWindow(self.root, [other, a1, a2]))
+        self.assertEqual(sorted(a1.regions), ["claude_order_order_1", "claude_order_order_2"])
+        self.assertEqual(a2.regions, {})
+        self.assertEqual(other.file_name_calls, 1)
+
+
+class TestRemoveBookmarks(unittest.TestCase):
+    def setUp(self):
+        self.ot, self.timers, _ = _load_order_table()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.views = [_FakeView("/p/a.py"), _FakeView("/p/b.py")]
+        window = _FakeWindow(self.root, self.views)
+        self.ot.sublime.active_window = lambda: window
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_removals_batched_and_undo_keeps_marker(self):
+        t = self.ot.OrderTable(self.root)
+        for p in ("a", "b", "c"):
+            t.add(p, file_path="/p/a.py", row=0)
+        for v in self.views:
+            for oid in ("order_1", "order_2", "order_3"):
+                v.regions[f"claude_order_{oid}"] = []
+        t.complete("order_1")
+        t.delete("order_2")
+        t.delete("order_3")
+        t.undo_delete()
+        self.assertEqual([f.__name__ for f in self.timers].count("_flush_unmarks"), 1)
+        _run_timers(self.timers)
+        for v in self.views:
+            self.assertEqual(list(v.regions), ["claude_order_order_3"])
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs unix sockets")
+class TestDaemonFire(unittest.TestCase):
+    def setUp(self):
+        self.ot, _, _ = _load_order_table()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ot.DAEMON_SOCKET_PATH = os.path.join(self.tmp.name, "d.sock")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.ot.DAEMON_SOCKET_PATH)
+        self.server.listen(4)
+        self.server.settimeout(2)
+
+    def tearDown(self):
+        self.server.close()
+        self.tmp.cleanup()
+
+    def test_one_connection_per_message(self):
+        t = self.ot.OrderTable(self.tmp.name)
+        t._fire_to_daemon({"order_id": "a"})
+        t._fire_to_daemon({"order_id": "b"})
+        self.ot._daemon_q.join()
+        got = []
+        for _ in range(2):
+            conn, _ = self.server.accept()
+            with conn:
+                data = b""
+                while True:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break  # client closed after its single message
+                    data += chunk
+            self.assertEqual(data.count(b"\n"), 1)
+            got.append(json.loads(data)["context"]["order_id"])
+        self.assertEqual(got, ["a", "b"])
+
+    def test_message_matches_full_encode(self):
+        t = self.ot.OrderTable(self.tmp.name)
+        sent = []
+        self.ot._queue_daemon_message = sent.append
+        context = {"order_id": "a", "prompt": "p \"q\" ✓", "row": None}
+        t._fire_to_daemon(context)
+        expected = {"method": "fire", "type": "order_added",
+                    "params": {"project": self.tmp.name}, "context": context}
+        self.assertEqual(sent, [(json.dumps(expected) + "\n").encode()])
+
+    def test_stop_daemon_writer_ends_thread(self):
+        self.ot._queue_daemon_message(b"x\n")
+        writer = self.ot._daemon_writer
+        self.ot.stop_daemon_writer()
+        writer.join(timeout=5)
+        self.assertFalse(writer.is_alive())
+        self.assertIsNone(self.ot._daemon_writer)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        self.ot._daemon_writer = object()  # no consumer
+        for i in range(self.ot._daemon_q.maxsize + 5):
+            self.ot._queue_daemon_message(b"x\n")
+        self.assertTrue(self.ot._daemon_q.full())
+
+
+class TestPruneStale(unittest.TestCase):
+    def test_removed_projects_and_closed_views_dropped(self):
+        ot, _, _ = _load_order_table()
+        gone = tempfile.TemporaryDirectory()
+        ot.get_table_for_cwd(gone.name)
+        gone.cleanup()
+        closed = types.SimpleNamespace(view=types.SimpleNamespace(is_valid=lambda: False))
+        ot._views["closed"] = closed
+        with tempfile.TemporaryDirectory() as root:
+            ot.get_table_for_cwd(root)
+            self.assertEqual(list(ot._tables), [root])
+        self.assertEqual(ot._views, {})
+
+
+class TestRelativePath(unittest.TestCase):
+    def test_nearest_folder_wins(self):
+        ot, _, _ = _load_order_table()
+        folders = ["/p", "/p/sub"]
+        self.assertEqual(ot._relative_path("/p/sub/a.py", folders), "a.py")
+        self.assertEqual(ot._relative_path("/p/b/c.py", folders), os.path.join("b", "c.py"))
+        self.assertEqual(ot._relative_path("/q/d.py", folders), "d.py")
+
+
+class TestLineDiff(unittest.TestCase):
+    def setUp(self):
+        self.ot, _, _ = _load_order_table()
+
+    def _apply(self, old, new):
+        text = "".join(l + "\n" for l in old)
+        diff = self.ot._line_diff(old, new)
+        if diff is None:
+            return text
+        start, end, repl = diff
+        return text[:start] + repl + text[end:]
+
+    def test_equal(self):
+        self.assertIsNone(self.ot._line_diff(["a", "b"], ["a", "b"]))
+
+    def test_patches_reproduce_new_buffer(self):
+        cases = [
+            (["a", "b"], ["a", "x", "b"]),
+            (["a", "x", "b"], ["a", "b"]),
+            (["a", "b", "c"], ["a", "B", "c"]),
+            (["a"], ["a", "a"]),
+            ([], ["a"]),
+            (["a", "b"], []),
+            (["h", "", "p1", "", "f"], ["h", "", "p1", "p2", "", "f"]),
+        ]
+        for old, new in cases:
+            self.assertEqual(self._apply(old, new), "".join(l + "\n" for l in new), (old, new))
+
+    def test_touches_only_changed_lines(self):
+        start, end, text = self.ot._line_diff(["a", "b", "c"], ["a", "B", "c"])
+        self.assertEqual((start, end, text), (2, 4, "B\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
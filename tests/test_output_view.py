@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Offline tests for OutputView pure helpers.
+
+Run:  python3 tests/test_output_view.py
+"""
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import types
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_output_view():
+    sublime = types.ModuleType("sublime")
+    sublime.Region = lambda a, b=None: (a, a if b is None else b)
+    sublime.Window = sublime.View = object
+    sublime.HIDDEN = 1
+    sublime.DRAW_NO_OUTLINE = 2
+    sublime.set_timeout = lambda f, t=0: None
+    sublime.load_settings = lambda n: None
+    sys.modules["sublime"] = sublime
+    sp = types.ModuleType("sublime_plugin")
+    sp.TextCommand = object
+    sys.modules["sublime_plugin"] = sp
+
+    pkg = types.ModuleType("ovpkg")
+    pkg.__path__ = [ROOT]
+    sys.modules["ovpkg"] = pkg
+    sys.modules.pop("ovpkg.output_view", None)
+    return importlib.import_module("ovpkg.output_view")
+
+
+class TestChangedSpan(unittest.TestCase):
+    def setUp(self):
+        self.ov = _load_output_view()
+
+    def _apply(self, old, new):
+        a, b, c = self.ov._changed_span(old, new)
+        return old[:a] + new[a:c] + old[b:]
+
+    def test_reproduces_new_text(self):
+        cases = [
+            ("", ""), ("", "abc"), ("abc", ""), ("abc", "abc"),
+            ("hello\n  ⠋\n", "hello world\n  ⠙\n"),
+            ("aaaa", "aaaaa"), ("aaaaa", "aaaa"),
+            ("x  ☐ Bash\ny", "x  ✔ Bash\ny"),
+            ("abcabc", "abc"), ("ab", "ba"),
+        ]
+        for old, new in cases:
+            self.assertEqual(self._apply(old, new), new, (old, new))
+
+    def test_span_is_minimal(self):
+        self.assertEqual(self.ov._changed_span("x  ☐ Bash\ny", "x  ✔ Bash\ny"), (3, 4, 4))
+        self.assertEqual(self.ov._changed_span("text\n  ⠋\n", "text more\n  ⠋\n"), (4, 4, 9))
+        self.assertEqual(self.ov._changed_span("same", "same"), (4, 4, 4))
+
+
+class TestToolDetailMemo(unittest.TestCase):
+    def test_recomputes_only_on_change(self):
+        ov = _load_output_view()
+        calls = []
+        ov.format_tool_detail = lambda view, tool: calls.append(1) or f" {tool.status}"
+        view = ov.OutputView.__new__(ov.OutputView)
+        tool = ov.ToolCall(name="Bash", tool_input={"command": "ls"})
+        self.assertEqual(view._format_tool_detail(tool), " pending")
+        view._format_tool_detail(tool)
+        self.assertEqual(len(calls), 1)
+        tool.status = "done"
+        self.assertEqual(view._format_tool_detail(tool), " done")
+        tool.tool_input["_media_path"] = "/tmp/x.png"
+        view._format_tool_detail(tool)
+        self.assertEqual(len(calls), 3)
+
+    def test_replaced_tool_input_of_same_size_recomputes(self):
+        ov = _load_output_view()
+        ov.format_tool_detail = lambda view, tool: " " + tool.tool_input["command"]
+        view = ov.OutputView.__new__(ov.OutputView)
+        tool = ov.ToolCall(name="Bash", tool_input={"command": "ls"})
+        view._format_tool_detail(tool)
+        for cmd in ("pwd", "whoami", "date"):
+            tool.tool_input = {"command": cmd}  # ACP tool_call_update re-emit
+            self.assertEqual(view._format_tool_detail(tool), " " + cmd)
+
+
+class TestIndentedPrompt(unittest.TestCase):
+    def test_continuation_lines_indented_and_cached(self):
+        ov = _load_output_view()
+        conv = ov.Conversation(prompt="fix\nthis\n\nplease")
+        self.assertEqual(conv.indented_prompt, "fix\n  this\n  \n  please")
+        self.assertIs(conv.indented_prompt, conv.indented_prompt)
+        conv.prompt = "one line"
+        self.assertEqual(conv.indented_prompt, "one line")
+
+
+class TestLastPending(unittest.TestCase):
+    def test_newest_open_tool_by_name(self):
+        ov = _load_output_view()
+        conv = ov.Conversation(prompt="p")
+        a, b, c = (ov.ToolCall(name=n, tool_input={}) for n in ("Read", "Read", "Bash"))
+        for t in (a, b, c):
+            conv.track_pending(t)
+        self.assertIs(conv.last_pending("Read"), b)
+        b.status = "done"
+        self.assertIs(conv.last_pending("Read"), a)
+        conv.untrack(a)
+        self.assertIsNone(conv.last_pending("Read"))
+        c.name = "Shell"
+        self.assertIsNone(conv.last_pending("Bash"))
+
+    def test_renamed_older_tool_stays_below_newer(self):
+        ov = _load_output_view()
+        conv = ov.Conversation(prompt="p")
+        old, new = ov.ToolCall(name="Tool", tool_input={}), ov.ToolCall(name="Read", tool_input={})
+        newer = ov.ToolCall(name="Read", tool_input={})
+        for t in (old, new, newer):
+            conv.events.append(t)
+            conv.track_pending(t)
+        old.name = "Read"  # upsert rename of the oldest row
+        conv.track_pending(old)
+        self.assertIs(conv.last_pending("Read"), newer)
+        newer.status = "done"
+        self.assertIs(conv.last_pending("Read"), new)
+        new.status = "done"
+        self.assertIs(conv.last_pending("Read"), old)
+
+
+class TestPermissionDetail(unittest.TestCase):
+    def test_dispatch_and_fallthrough(self):
+        ov = _load_output_view()
+        d = ov._PERMISSION_DETAIL
+        self.assertEqual(d["Bash"]({"command": "x" * 90}), ("Bash", "x" * 80 + "..."))
+        self.assertEqual(d["Edit"]({"file_path": "/a.py"}), (None, "/a.py"))
+        self.assertEqual(d["Skill"]({"skill": "pdf", "args": ""}), ("Skill: pdf", ""))
+        self.assertIsNone(d["Grep"]({"path": "."}))
+        self.assertIsNone(d["Bash"]({}))
+
+    def test_button_spans_cover_labels(self):
+        ov = _load_output_view()
+        row = ov._PERM_BUTTON_ROW
+        labels = [row[a:b] for _, a, b in ov._PERM_BUTTON_SPANS]
+        self.assertEqual(labels, ["[Y] Allow", "[N] Deny", "[S] Allow 30s"])
+
+
+class TestTextCoalescing(unittest.TestCase):
+    def test_burst_merges_events_and_schedules_one_render(self):
+        ov = _load_output_view()
+        timers = []
+        ov.sublime.set_timeout = lambda f, t=0: timers.append((f, t))
+        view = ov.OutputView.__new__(ov.OutputView)
+        view.view = object()
+        view.current = ov.Conversation(prompt="p")
+        view._render_pending = False
+        for chunk in ("Hel", "lo", ", ", "world"):
+            view.text(chunk)
+        self.assertEqual(view.current.events, ["Hello, world"])
+        self.assertEqual(timers, [(view._flush_render, view.RENDER_DELAY_MS)])
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_buffer_edits_drop_cached_frame(self):
+        ov = _load_output_view()
+
+        class _View:
+            def __init__(self):
+                self.commands = []
+
+            def is_valid(self):
+                return True
+
+            def run_command(self, name, args):
+                self.commands.append(name)
+
+        view = ov.OutputView.__new__(ov.OutputView)
+        view.view = _View()
+        view._input_mode = False
+        view.current = ov.Conversation(prompt="p")
+        view._rendered = (view.current, 0, "  ☐ Read\n")
+        view._replace(2, 3, "✔")
+        self.assertIsNone(view._rendered)
+        view._rendered = (view.current, 0, "  ☐ Read\n")
+        view._batch_replace([(2, 3, "✘")])
+        self.assertIsNone(view._rendered)
+        self.assertEqual(view.view.commands, ["claude_replace", "claude_batch_edit"])
+
+
+class TestBatchEdit(unittest.TestCase):
+    def test_ops_apply_against_original_offsets(self):
+        _load_output_view()
+        sys.modules["sublime_plugin"].WindowCommand = object
+        sys.modules["sublime_plugin"].ApplicationCommand = object
+        cmds_pkg = types.ModuleType("ovpkg.commands")
+        cmds_pkg.__path__ = [os.path.join(ROOT, "commands")]
+        sys.modules["ovpkg.commands"] = cmds_pkg
+        stubs = {
+            "core": ("get_active_session", "get_session_for_view", "create_session"),
+            "session": ("Session", "load_saved_sessions", "load_bookmarks", "toggle_bookmark"),
+            "prompt_builder": ("PromptBuilder",),
+            "command_parser": ("CommandParser",),
+            "backends": (),
+        }
+        for name, attrs in stubs.items():
+            mod = types.ModuleType("ovpkg." + name)
+            for attr in attrs:
+                setattr(mod, attr, None)
+            sys.modules["ovpkg." + name] = mod
+        sys.modules["ovpkg.backends"].default_models_dict = dict
+        sys.modules.pop("ovpkg.commands.text_cmds", None)
+        sys.modules.pop("ovpkg.output_cmds", None)
+        cmds = importlib.import_module("ovpkg.output_cmds")
+        batch_cmd = cmds.ClaudeBatchEditCommand
+        self.assertIs(batch_cmd, sys.modules["ovpkg.commands.text_cmds"].ClaudeBatchEditCommand)
+
+        class _View:
+            text = "a ⚙ b ⚙ c"
+
+            def replace(self, edit, region, text):
+                a, b = region
+                self.text = self.text[:a] + text + self.text[b:]
+
+        cmd = batch_cmd()
+        cmd.view = _View()
+        cmd.run(None, [(2, 3, "✘"), (6, 7, "✘✘"), (0, 0, ">")])
+        self.assertEqual(cmd.view.text, ">a ✘ b ✘✘ c")
+
+
+if __name__ == "__main__":
+    unittest.main()